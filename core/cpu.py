@@ -1,11 +1,34 @@
 """CPU state model for the Cambridge Assembly Emulator."""
 
 from typing import Optional
+from .word import make_normalizer
+
+
+# Compare flag states (an int so conditional jumps test it with one compare)
+FLAG_UNDEFINED = -1
+FLAG_FALSE = 0
+FLAG_TRUE = 1
 
 
 class CPU:
     """CPU state with registers and value normalization."""
 
+    __slots__ = (
+        "word_bits",
+        "signed",
+        "_min_val",
+        "_max_val",
+        "_mask",
+        "_sign_bit",
+        "normalize",
+        "acc",
+        "ix",
+        "pc",
+        "flag",
+        "ir",
+        "halted",
+    )
+
     def __init__(self, word_bits: int = 16, signed: bool = True):
         self.word_bits = word_bits
         self.signed = signed
@@ -19,29 +42,41 @@ class CPU:
             self._max_val = (1 << word_bits) - 1
 
         self._mask = (1 << word_bits) - 1
+        # 0 for unsigned words, so the setters can sign-extend unconditionally
+        self._sign_bit = 1 << (word_bits - 1) if signed else 0
+        self.normalize = make_normalizer(word_bits, signed)
 
         # Registers
         self.acc: int = 0
         self.ix: int = 0
         self.pc: int = 0
-        self.flag: Optional[bool] = None
+        self.flag: int = FLAG_UNDEFINED
         self.ir: str = ""  # Current instruction for debugging
         self.halted: bool = False
 
-    def normalize(self, value: int) -> int:
-        """Normalize value to configured word width and signedness."""
-        value = value & self._mask
-        if self.signed and value > self._max_val:
-            value -= 1 << self.word_bits
-        return value
-
     def set_acc(self, value: int) -> None:
-        """Set ACC with normalization."""
-        self.acc = self.normalize(value)
+        """Set ACC with normalization (skipped when already in range)."""
+        if self._min_val <= value <= self._max_val:
+            self.acc = value
+        else:
+            # Same as self.normalize(value), inlined to save a call
+            sign_bit = self._sign_bit
+            self.acc = ((value & self._mask) ^ sign_bit) - sign_bit
 
     def set_ix(self, value: int) -> None:
-        """Set IX with normalization."""
-        self.ix = self.normalize(value)
+        """Set IX with normalization (skipped when already in range)."""
+        if self._min_val <= value <= self._max_val:
+            self.ix = value
+        else:
+            # Same as self.normalize(value), inlined to save a call
+            sign_bit = self._sign_bit
+            self.ix = ((value & self._mask) ^ sign_bit) - sign_bit
+
+    def get_flag(self) -> Optional[bool]:
+        """Get the compare flag as a bool, or None before any comparison."""
+        if self.flag < 0:
+            return None
+        return self.flag > 0
 
     def get_state(self) -> dict:
         """Get current register state as dictionary."""
@@ -49,7 +84,7 @@ class CPU:
             "acc": self.acc,
             "ix": self.ix,
             "pc": self.pc,
-            "flag": self.flag,
+            "flag": self.get_flag(),
         }
 
     def reset(self, start_address: int = 0) -> None:
@@ -57,6 +92,6 @@ class CPU:
         self.acc = 0
         self.ix = 0
         self.pc = start_address
-        self.flag = None
+        self.flag = FLAG_UNDEFINED
         self.ir = ""
         self.halted = False
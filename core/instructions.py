@@ -1,64 +1,78 @@
 """Instruction execution for Cambridge Assembly Emulator."""
 
-from typing import Callable, Optional
-from .cpu import CPU
+from typing import Callable, Iterable, Optional, Union
+from .cpu import CPU, FLAG_FALSE, FLAG_TRUE
 from .memory import Memory
-from .parser import Instruction
-from .errors import JumpWithoutCompare, InputUnderflow, InvalidShiftAmount
+from .parser import (
+    Instruction,
+    OperandType,
+    ParsedProgram,
+    OP_LDR,
+    OP_ADD,
+    OP_SUB,
+    OP_INC,
+    OP_DEC,
+    OP_CMP,
+    OP_JPE,
+    OP_JPN,
+    OP_AND,
+    OP_OR,
+    OP_XOR,
+    OP_CMPJPE,
+    OP_CMPJPN,
+    OP_INCMEM,
+    OP_DECMEM,
+)
+from .errors import JumpWithoutCompare, InputUnderflow, InvalidShiftAmount, MemoryAccessError
 
 
 class IOBuffer:
     """Input/Output buffer for IN/OUT instructions."""
 
+    __slots__ = ("_input", "_input_pos", "_output", "last_in_code", "last_out_code", "io_count")
+
     def __init__(self, input_text: str = ""):
-        self._input = list(input_text)
+        # Indexing bytes yields character codes directly; text outside
+        # Latin-1 keeps its code points in a plain list instead
+        try:
+            self._input: Union[bytes, list[int]] = input_text.encode("latin-1")
+        except UnicodeEncodeError:
+            self._input = [ord(char) for char in input_text]
         self._input_pos = 0
-        self._output: list[str] = []
+        self._output = bytearray()
+        # Codes of the most recent I/O operation (the other one is None);
+        # io_count tells the tracer whether a step performed I/O
         self.last_in_code: Optional[int] = None
         self.last_out_code: Optional[int] = None
+        self.io_count = 0
 
     def read_char(self) -> int:
         """Read next character from input buffer as ASCII code."""
-        self.last_in_code = None
         if self._input_pos >= len(self._input):
             raise InputUnderflow("Input buffer is empty")
-        char = self._input[self._input_pos]
+        code = self._input[self._input_pos]
         self._input_pos += 1
-        self.last_in_code = ord(char)
-        return self.last_in_code
+        self.last_in_code = code
+        self.last_out_code = None
+        self.io_count += 1
+        return code
 
     def write_char(self, code: int) -> None:
         """Write character to output buffer."""
-        self.last_out_code = code & 0xFF
-        self._output.append(chr(self.last_out_code))
+        code &= 0xFF
+        self._output.append(code)
+        self.last_in_code = None
+        self.last_out_code = code
+        self.io_count += 1
 
     def get_output(self) -> str:
         """Get accumulated output as string."""
-        return "".join(self._output)
-
-    def reset_io_codes(self) -> None:
-        """Reset last I/O codes for new instruction."""
-        self.last_in_code = None
-        self.last_out_code = None
-
-
-def _word_mask(cpu: CPU) -> int:
-    """Return mask for current word width."""
-    return (1 << cpu.word_bits) - 1
-
-
-def _get_bitwise_operand(instr: Instruction, cpu: CPU, mem: Memory) -> int:
-    """Fetch operand for bitwise ops, returning unsigned value."""
-    if instr.operand_type == "immediate":
-        value = instr.operand_value
-    else:
-        value = mem.read(instr.operand_value)
-    return value & _word_mask(cpu)
+        return self._output.decode("latin-1")
 
 
 def _get_shift_amount(instr: Instruction) -> int:
     """Validate and return shift amount."""
-    if instr.operand_type != "immediate" or instr.operand_value is None:
+    if instr.operand_type != OperandType.IMMEDIATE or instr.operand_value is None:
         raise InvalidShiftAmount("Shift amount must be immediate")
     amount = instr.operand_value
     if amount < 0:
@@ -71,37 +85,58 @@ InstructionExecutor = Callable[[Instruction, CPU, Memory, IOBuffer], Optional[in
 
 
 def execute_ldm(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
-    """LDM #n: ACC := n"""
+    """LDM #n: ACC := n (LDM a loads the address a itself)"""
     cpu.set_acc(instr.operand_value)
     return None
 
 
 def execute_ldd(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """LDD a: ACC := MEM[a]"""
-    cpu.set_acc(mem.read(instr.operand_value))
+    # Memory words are already normalized to the CPU word width
+    cpu.acc = mem.read(instr.operand_value)
     return None
 
 
 def execute_ldi(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """LDI a: ACC := MEM[MEM[a]]"""
     indirect_addr = mem.read(instr.operand_value)
-    cpu.set_acc(mem.read(indirect_addr))
+    cpu.acc = mem.read(indirect_addr)
     return None
 
 
 def execute_ldx(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """LDX a: ACC := MEM[a + IX]"""
     addr = instr.operand_value + cpu.ix
-    cpu.set_acc(mem.read(addr))
+    # Indexing rejects addr >= size itself, as in Memory.read
+    if addr < 0:
+        raise MemoryAccessError(f"Memory address out of range: {addr}")
+    try:
+        # Memory words are already normalized to the CPU word width
+        cpu.acc = mem._data[addr]
+    except IndexError:
+        raise MemoryAccessError(f"Memory address out of range: {addr}") from None
     return None
 
 
 def execute_ldr(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """LDR #n: IX := n, or LDR ACC: IX := ACC"""
-    if instr.operand_type == "immediate":
+    if instr.operand_type == OperandType.IMMEDIATE:
         cpu.set_ix(instr.operand_value)
     elif instr.operand == "ACC":
         cpu.set_ix(cpu.acc)
+    # Other operands (LDR a, LDR IX) are accepted and leave IX unchanged
+    return None
+
+
+def execute_ldr_imm(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """LDR #n: IX := n"""
+    cpu.set_ix(instr.operand_value)
+    return None
+
+
+def execute_ldr_acc(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """LDR ACC: IX := ACC"""
+    cpu.set_ix(cpu.acc)
     return None
 
 
@@ -137,46 +172,110 @@ def execute_out(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Opti
 
 def execute_add(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """ADD #n or ADD a: ACC := ACC + operand"""
-    if instr.operand_type == "immediate":
+    if instr.operand_type == OperandType.IMMEDIATE:
         cpu.set_acc(cpu.acc + instr.operand_value)
     else:
         cpu.set_acc(cpu.acc + mem.read(instr.operand_value))
     return None
 
 
+def execute_add_imm(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """ADD #n: ACC := ACC + n"""
+    cpu.set_acc(cpu.acc + instr.operand_value)
+    return None
+
+
+def execute_add_mem(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """ADD a: ACC := ACC + MEM[a]"""
+    cpu.set_acc(cpu.acc + mem.read(instr.operand_value))
+    return None
+
+
 def execute_sub(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """SUB #n or SUB a: ACC := ACC - operand"""
-    if instr.operand_type == "immediate":
+    if instr.operand_type == OperandType.IMMEDIATE:
         cpu.set_acc(cpu.acc - instr.operand_value)
     else:
         cpu.set_acc(cpu.acc - mem.read(instr.operand_value))
     return None
 
 
+def execute_sub_imm(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """SUB #n: ACC := ACC - n"""
+    cpu.set_acc(cpu.acc - instr.operand_value)
+    return None
+
+
+def execute_sub_mem(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """SUB a: ACC := ACC - MEM[a]"""
+    cpu.set_acc(cpu.acc - mem.read(instr.operand_value))
+    return None
+
+
+# Bitwise results are only normalized once, by set_acc: masking the inputs
+# first would give the same low word_bits and the same normalized value.
+
+
 def execute_and(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """AND operand: ACC := ACC AND operand (bitwise)."""
-    mask = _word_mask(cpu)
-    acc_val = cpu.acc & mask
-    operand = _get_bitwise_operand(instr, cpu, mem)
-    cpu.set_acc(acc_val & operand)
+    if instr.operand_type == OperandType.IMMEDIATE:
+        cpu.set_acc(cpu.acc & instr.operand_value)
+    else:
+        cpu.set_acc(cpu.acc & mem.read(instr.operand_value))
+    return None
+
+
+def execute_and_imm(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """AND #n: ACC := ACC AND n."""
+    cpu.set_acc(cpu.acc & instr.operand_value)
+    return None
+
+
+def execute_and_mem(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """AND a: ACC := ACC AND MEM[a]."""
+    cpu.set_acc(cpu.acc & mem.read(instr.operand_value))
     return None
 
 
 def execute_or(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """OR operand: ACC := ACC OR operand."""
-    mask = _word_mask(cpu)
-    acc_val = cpu.acc & mask
-    operand = _get_bitwise_operand(instr, cpu, mem)
-    cpu.set_acc(acc_val | operand)
+    if instr.operand_type == OperandType.IMMEDIATE:
+        cpu.set_acc(cpu.acc | instr.operand_value)
+    else:
+        cpu.set_acc(cpu.acc | mem.read(instr.operand_value))
+    return None
+
+
+def execute_or_imm(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """OR #n: ACC := ACC OR n."""
+    cpu.set_acc(cpu.acc | instr.operand_value)
+    return None
+
+
+def execute_or_mem(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """OR a: ACC := ACC OR MEM[a]."""
+    cpu.set_acc(cpu.acc | mem.read(instr.operand_value))
     return None
 
 
 def execute_xor(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """XOR operand: ACC := ACC XOR operand."""
-    mask = _word_mask(cpu)
-    acc_val = cpu.acc & mask
-    operand = _get_bitwise_operand(instr, cpu, mem)
-    cpu.set_acc(acc_val ^ operand)
+    if instr.operand_type == OperandType.IMMEDIATE:
+        cpu.set_acc(cpu.acc ^ instr.operand_value)
+    else:
+        cpu.set_acc(cpu.acc ^ mem.read(instr.operand_value))
+    return None
+
+
+def execute_xor_imm(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """XOR #n: ACC := ACC XOR n."""
+    cpu.set_acc(cpu.acc ^ instr.operand_value)
+    return None
+
+
+def execute_xor_mem(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """XOR a: ACC := ACC XOR MEM[a]."""
+    cpu.set_acc(cpu.acc ^ mem.read(instr.operand_value))
     return None
 
 
@@ -189,6 +288,18 @@ def execute_inc(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Opti
     return None
 
 
+def execute_inc_acc(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """INC ACC: ACC := ACC + 1."""
+    cpu.set_acc(cpu.acc + 1)
+    return None
+
+
+def execute_inc_ix(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """INC IX: IX := IX + 1."""
+    cpu.set_ix(cpu.ix + 1)
+    return None
+
+
 def execute_dec(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """DEC ACC or DEC IX: decrement register"""
     if instr.operand == "IX":
@@ -198,43 +309,62 @@ def execute_dec(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Opti
     return None
 
 
+def execute_dec_acc(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """DEC ACC: ACC := ACC - 1."""
+    cpu.set_acc(cpu.acc - 1)
+    return None
+
+
+def execute_dec_ix(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """DEC IX: IX := IX - 1."""
+    cpu.set_ix(cpu.ix - 1)
+    return None
+
+
 def execute_lsl(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """LSL #n: logical shift left."""
     amount = _get_shift_amount(instr)
-    mask = _word_mask(cpu)
     if amount >= cpu.word_bits:
         cpu.set_acc(0)
         return None
-    acc_val = cpu.acc & mask
-    cpu.set_acc((acc_val << amount) & mask)
+    # set_acc drops the bits shifted out of the word
+    cpu.set_acc(cpu.acc << amount)
     return None
 
 
 def execute_lsr(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """LSR #n: logical shift right."""
     amount = _get_shift_amount(instr)
-    mask = _word_mask(cpu)
-    if amount >= cpu.word_bits:
-        cpu.set_acc(0)
-        return None
-    acc_val = cpu.acc & mask
-    cpu.set_acc(acc_val >> amount)
+    # Masking first shifts in zeros; amounts >= word_bits leave 0
+    cpu.set_acc((cpu.acc & cpu._mask) >> amount)
     return None
 
 
 def execute_cmp(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """CMP #n or CMP a: FLAG := (ACC == operand)"""
-    if instr.operand_type == "immediate":
-        cpu.flag = cpu.acc == instr.operand_value
+    if instr.operand_type == OperandType.IMMEDIATE:
+        cpu.flag = FLAG_TRUE if cpu.acc == instr.operand_value else FLAG_FALSE
     else:
-        cpu.flag = cpu.acc == mem.read(instr.operand_value)
+        cpu.flag = FLAG_TRUE if cpu.acc == mem.read(instr.operand_value) else FLAG_FALSE
+    return None
+
+
+def execute_cmp_imm(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """CMP #n: FLAG := (ACC == n)"""
+    cpu.flag = FLAG_TRUE if cpu.acc == instr.operand_value else FLAG_FALSE
+    return None
+
+
+def execute_cmp_mem(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """CMP a: FLAG := (ACC == MEM[a])"""
+    cpu.flag = FLAG_TRUE if cpu.acc == mem.read(instr.operand_value) else FLAG_FALSE
     return None
 
 
 def execute_cmi(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """CMI a: FLAG := (ACC == MEM[MEM[a]])"""
     indirect_addr = mem.read(instr.operand_value)
-    cpu.flag = cpu.acc == mem.read(indirect_addr)
+    cpu.flag = FLAG_TRUE if cpu.acc == mem.read(indirect_addr) else FLAG_FALSE
     return None
 
 
@@ -245,50 +375,184 @@ def execute_jmp(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Opti
 
 def execute_jpe(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """JPE a: if FLAG == True, PC := a"""
-    if cpu.flag is None:
-        raise JumpWithoutCompare("JPE executed without prior comparison")
-    if cpu.flag:
+    if cpu.flag > 0:
         return instr.operand_value
+    if cpu.flag < 0:
+        raise JumpWithoutCompare("JPE executed without prior comparison")
     return None
 
 
 def execute_jpn(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
     """JPN a: if FLAG == False, PC := a"""
-    if cpu.flag is None:
+    if cpu.flag == 0:
+        return instr.operand_value
+    if cpu.flag < 0:
         raise JumpWithoutCompare("JPN executed without prior comparison")
-    if not cpu.flag:
+    return None
+
+
+def execute_jpe_fast(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """JPE a where the parser proved a prior comparison: if FLAG, PC := a"""
+    if cpu.flag > 0:
         return instr.operand_value
     return None
 
 
-# Instruction dispatch table
-INSTRUCTION_EXECUTORS: dict[str, InstructionExecutor] = {
-    "LDM": execute_ldm,
-    "LDD": execute_ldd,
-    "LDI": execute_ldi,
-    "LDX": execute_ldx,
-    "LDR": execute_ldr,
-    "MOV": execute_mov,
-    "STO": execute_sto,
-    "END": execute_end,
-    "IN": execute_in,
-    "OUT": execute_out,
-    "ADD": execute_add,
-    "SUB": execute_sub,
-    "AND": execute_and,
-    "OR": execute_or,
-    "XOR": execute_xor,
-    "INC": execute_inc,
-    "DEC": execute_dec,
-    "LSL": execute_lsl,
-    "LSR": execute_lsr,
-    "CMP": execute_cmp,
-    "CMI": execute_cmi,
-    "JMP": execute_jmp,
-    "JPE": execute_jpe,
-    "JPN": execute_jpn,
+def execute_jpn_fast(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """JPN a where the parser proved a prior comparison: if not FLAG, PC := a"""
+    if cpu.flag == 0:
+        return instr.operand_value
+    return None
+
+
+def execute_cmp_imm_jpe(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """CMP #n; JPE t: FLAG := (ACC == n), PC := t if FLAG"""
+    if cpu.acc == instr.operand_value:
+        cpu.flag = FLAG_TRUE
+        return instr.jump_target
+    cpu.flag = FLAG_FALSE
+    return None
+
+
+def execute_cmp_mem_jpe(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """CMP a; JPE t: FLAG := (ACC == MEM[a]), PC := t if FLAG"""
+    if cpu.acc == mem.read(instr.operand_value):
+        cpu.flag = FLAG_TRUE
+        return instr.jump_target
+    cpu.flag = FLAG_FALSE
+    return None
+
+
+def execute_cmp_imm_jpn(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """CMP #n; JPN t: FLAG := (ACC == n), PC := t if not FLAG"""
+    if cpu.acc == instr.operand_value:
+        cpu.flag = FLAG_TRUE
+        return None
+    cpu.flag = FLAG_FALSE
+    return instr.jump_target
+
+
+def execute_cmp_mem_jpn(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """CMP a; JPN t: FLAG := (ACC == MEM[a]), PC := t if not FLAG"""
+    if cpu.acc == mem.read(instr.operand_value):
+        cpu.flag = FLAG_TRUE
+        return None
+    cpu.flag = FLAG_FALSE
+    return instr.jump_target
+
+
+def execute_inc_mem(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """LDD a; INC ACC; STO a: ACC := MEM[a] + 1, MEM[a] := ACC"""
+    cpu.set_acc(mem.read(instr.operand_value) + 1)
+    mem.write(instr.operand_value, cpu.acc)
+    return None
+
+
+def execute_dec_mem(instr: Instruction, cpu: CPU, mem: Memory, io: IOBuffer) -> Optional[int]:
+    """LDD a; DEC ACC; STO a: ACC := MEM[a] - 1, MEM[a] := ACC"""
+    cpu.set_acc(mem.read(instr.operand_value) - 1)
+    mem.write(instr.operand_value, cpu.acc)
+    return None
+
+
+# Instruction dispatch table, indexed by opcode id (see OPCODE_NAMES)
+INSTRUCTION_TABLE: tuple[InstructionExecutor, ...] = (
+    execute_ldm,
+    execute_ldd,
+    execute_ldi,
+    execute_ldx,
+    execute_ldr,
+    execute_mov,
+    execute_sto,
+    execute_end,
+    execute_in,
+    execute_out,
+    execute_add,
+    execute_sub,
+    execute_inc,
+    execute_dec,
+    execute_cmp,
+    execute_cmi,
+    execute_jmp,
+    execute_jpe,
+    execute_jpn,
+    execute_lsl,
+    execute_lsr,
+    execute_and,
+    execute_or,
+    execute_xor,
+)
+
+# Executors specialized by operand type, keyed by (opcode id, operand_type)
+SPECIALIZED_EXECUTORS: dict[tuple[int, OperandType], InstructionExecutor] = {
+    (OP_ADD, OperandType.IMMEDIATE): execute_add_imm,
+    (OP_ADD, OperandType.DIRECT): execute_add_mem,
+    (OP_SUB, OperandType.IMMEDIATE): execute_sub_imm,
+    (OP_SUB, OperandType.DIRECT): execute_sub_mem,
+    (OP_CMP, OperandType.IMMEDIATE): execute_cmp_imm,
+    (OP_CMP, OperandType.DIRECT): execute_cmp_mem,
+    (OP_AND, OperandType.IMMEDIATE): execute_and_imm,
+    (OP_AND, OperandType.DIRECT): execute_and_mem,
+    (OP_OR, OperandType.IMMEDIATE): execute_or_imm,
+    (OP_OR, OperandType.DIRECT): execute_or_mem,
+    (OP_XOR, OperandType.IMMEDIATE): execute_xor_imm,
+    (OP_XOR, OperandType.DIRECT): execute_xor_mem,
+    (OP_LDR, OperandType.IMMEDIATE): execute_ldr_imm,
+    (OP_INC, OperandType.NONE): execute_inc_acc,
+    (OP_DEC, OperandType.NONE): execute_dec_acc,
+    (OP_CMPJPE, OperandType.IMMEDIATE): execute_cmp_imm_jpe,
+    (OP_CMPJPE, OperandType.DIRECT): execute_cmp_mem_jpe,
+    (OP_CMPJPN, OperandType.IMMEDIATE): execute_cmp_imm_jpn,
+    (OP_CMPJPN, OperandType.DIRECT): execute_cmp_mem_jpn,
+    (OP_INCMEM, OperandType.DIRECT): execute_inc_mem,
+    (OP_DECMEM, OperandType.DIRECT): execute_dec_mem,
+}
+
+# Executors for register operands, keyed by (opcode id, register name)
+REGISTER_EXECUTORS: dict[tuple[int, str], InstructionExecutor] = {
+    (OP_LDR, "ACC"): execute_ldr_acc,
+    (OP_INC, "ACC"): execute_inc_acc,
+    (OP_INC, "IX"): execute_inc_ix,
+    (OP_DEC, "ACC"): execute_dec_acc,
+    (OP_DEC, "IX"): execute_dec_ix,
 }
 
+# Executors usable once the parser has proven the compare flag is set
+FLAG_DEFINED_EXECUTORS: dict[int, InstructionExecutor] = {
+    OP_JPE: execute_jpe_fast,
+    OP_JPN: execute_jpn_fast,
+}
+
+
+def select_executor(instr: Instruction) -> InstructionExecutor:
+    """Resolve the executor for an instruction, preferring a specialized one."""
+    executor = None
+    if instr.flag_defined:
+        executor = FLAG_DEFINED_EXECUTORS.get(instr.op_id)
+    if executor is None and instr.operand_type == OperandType.REGISTER:
+        executor = REGISTER_EXECUTORS.get((instr.op_id, instr.operand))
+    if executor is None:
+        executor = SPECIALIZED_EXECUTORS.get((instr.op_id, instr.operand_type))
+    if executor is None:
+        if not 0 <= instr.op_id < len(INSTRUCTION_TABLE):
+            raise ValueError(f"No executor for opcode: {instr.opcode}")
+        executor = INSTRUCTION_TABLE[instr.op_id]
+    return executor
+
+
+def bind_executors(instructions: Iterable[Instruction]) -> None:
+    """Resolve and attach the executor of every instruction once, before execution."""
+    for instr in instructions:
+        instr.handler = select_executor(instr)
+
+
+def bind_program(program: ParsedProgram) -> None:
+    """Bind executors for a parsed program and pack its blocks for execution."""
+    bind_executors(program.instructions.values())
+    bind_executors(program.fused.values())
+    for block in program.blocks.values():
+        block.ops = tuple((instr.handler, instr) for instr in block.instructions)
+
 
 def execute_instruction(
     instr: Instruction,
@@ -301,7 +565,7 @@ def execute_instruction(
     Returns:
         New PC value if instruction is a jump, None otherwise
     """
-    executor = INSTRUCTION_EXECUTORS.get(instr.opcode)
-    if executor is None:
-        raise ValueError(f"No executor for opcode: {instr.opcode}")
-    return executor(instr, cpu, mem, io)
+    handler = instr.handler
+    if handler is None:
+        handler = instr.handler = select_executor(instr)
+    return handler(instr, cpu, mem, io)
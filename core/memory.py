@@ -1,12 +1,39 @@
 """Memory model for the Cambridge Assembly Emulator."""
 
-from typing import Optional
+from array import array
+from typing import Optional, Union
 from .errors import MemoryAccessError
+from .word import make_normalizer
+
+
+# array typecodes ordered by item size, for signed and unsigned words
+_SIGNED_TYPECODES = ("b", "h", "i", "l", "q")
+_UNSIGNED_TYPECODES = ("B", "H", "I", "L", "Q")
+
+
+def _word_typecode(word_bits: int, signed: bool) -> Optional[str]:
+    """Return the smallest array typecode that holds a word, or None if none fits."""
+    for code in _SIGNED_TYPECODES if signed else _UNSIGNED_TYPECODES:
+        if array(code).itemsize * 8 >= word_bits:
+            return code
+    return None
 
 
 class Memory:
     """Linear memory model with configurable size and word width."""
 
+    __slots__ = (
+        "size",
+        "word_bits",
+        "signed",
+        "_data",
+        "_min_val",
+        "_max_val",
+        "_mask",
+        "_sign_bit",
+        "normalize",
+    )
+
     def __init__(
         self,
         size: int = 256,
@@ -17,7 +44,13 @@ class Memory:
         self.size = size
         self.word_bits = word_bits
         self.signed = signed
-        self._data: list[int] = [0] * size
+        # Fixed-width words are stored unboxed in a contiguous buffer
+        typecode = _word_typecode(word_bits, signed)
+        self._data: Union[array, list[int]] = (
+            array(typecode, bytes(array(typecode).itemsize * size))
+            if typecode
+            else [0] * size
+        )
 
         # Pre-compute normalization bounds
         if signed:
@@ -28,6 +61,9 @@ class Memory:
             self._max_val = (1 << word_bits) - 1
 
         self._mask = (1 << word_bits) - 1
+        # 0 for unsigned words, so write() can sign-extend unconditionally
+        self._sign_bit = 1 << (word_bits - 1) if signed else 0
+        self.normalize = make_normalizer(word_bits, signed)
 
         # Initialize with provided values
         if initial_values:
@@ -35,36 +71,33 @@ class Memory:
                 if 0 <= addr < size:
                     self._data[addr] = self.normalize(val)
 
-    def normalize(self, value: int) -> int:
-        """Normalize value to configured word width and signedness."""
-        value = value & self._mask
-        if self.signed and value > self._max_val:
-            value -= 1 << self.word_bits
-        return value
-
-    def _check_bounds(self, addr: int) -> None:
-        """Check if address is within valid range."""
-        if addr < 0 or addr >= self.size:
-            raise MemoryAccessError(f"Memory address out of range: {addr}")
-
     def read(self, addr: int) -> int:
         """Read value from memory address."""
-        self._check_bounds(addr)
-        return self._data[addr]
+        # Indexing rejects addr >= size itself; only negatives need a test
+        if addr < 0:
+            raise MemoryAccessError(f"Memory address out of range: {addr}")
+        try:
+            return self._data[addr]
+        except IndexError:
+            raise MemoryAccessError(f"Memory address out of range: {addr}") from None
 
     def write(self, addr: int, value: int) -> None:
         """Write normalized value to memory address."""
-        self._check_bounds(addr)
-        self._data[addr] = self.normalize(value)
+        if addr < 0:
+            raise MemoryAccessError(f"Memory address out of range: {addr}")
+        try:
+            # Same as self.normalize(value), inlined to save a call per store
+            self._data[addr] = ((value & self._mask) ^ self._sign_bit) - self._sign_bit
+        except IndexError:
+            raise MemoryAccessError(f"Memory address out of range: {addr}") from None
 
     def get_watched(self, addresses: list[int]) -> dict[str, int]:
         """Get values at watched addresses as string-keyed dict."""
-        result = {}
-        for addr in addresses:
-            if 0 <= addr < self.size:
-                result[str(addr)] = self._data[addr]
-        return result
+        size = self.size
+        valid = [addr for addr in addresses if 0 <= addr < size]
+        # Gather keys and values with C-level map() rather than a Python loop
+        return dict(zip(map(str, valid), map(self._data.__getitem__, valid)))
 
     def snapshot(self) -> list[int]:
         """Return a copy of the entire memory."""
-        return self._data.copy()
+        return list(self._data)
@@ -1,8 +1,9 @@
 """Program parser for Cambridge Assembly language."""
 
-import re
-from dataclasses import dataclass
-from typing import Optional
+import sys
+from dataclasses import dataclass, field, replace
+from enum import IntEnum
+from typing import Callable, Optional
 from .errors import (
     ParseError,
     UnknownOpcode,
@@ -14,8 +15,8 @@ from .errors import (
 )
 
 
-# Valid opcodes
-VALID_OPCODES = {
+# Opcode names; the position of each name is its numeric opcode id
+OPCODE_NAMES = (
     "LDM",
     "LDD",
     "LDI",
@@ -40,57 +41,197 @@ VALID_OPCODES = {
     "AND",
     "OR",
     "XOR",
+)
+
+(
+    OP_LDM,
+    OP_LDD,
+    OP_LDI,
+    OP_LDX,
+    OP_LDR,
+    OP_MOV,
+    OP_STO,
+    OP_END,
+    OP_IN,
+    OP_OUT,
+    OP_ADD,
+    OP_SUB,
+    OP_INC,
+    OP_DEC,
+    OP_CMP,
+    OP_CMI,
+    OP_JMP,
+    OP_JPE,
+    OP_JPN,
+    OP_LSL,
+    OP_LSR,
+    OP_AND,
+    OP_OR,
+    OP_XOR,
+) = range(len(OPCODE_NAMES))
+
+OPCODE_TO_ID: dict[str, int] = {name: op_id for op_id, name in enumerate(OPCODE_NAMES)}
+
+# Superinstructions built from common sequences, numbered after the opcodes
+FUSED_OPCODE_NAMES = (
+    "CMPJPE",
+    "CMPJPN",
+    "INCMEM",
+    "DECMEM",
+)
+
+(
+    OP_CMPJPE,
+    OP_CMPJPN,
+    OP_INCMEM,
+    OP_DECMEM,
+) = range(len(OPCODE_NAMES), len(OPCODE_NAMES) + len(FUSED_OPCODE_NAMES))
+
+# Opcodes that end a basic block
+CONTROL_OPS = frozenset((OP_END, OP_JMP, OP_JPE, OP_JPN, OP_CMPJPE, OP_CMPJPN))
+
+# Valid opcodes
+VALID_OPCODES = set(OPCODE_NAMES)
+
+# Opcode flags
+_NO_OPERAND = 1  # Operand not allowed
+_NEEDS_OPERAND = 2  # Operand required (otherwise optional)
+_SHIFT = 4
+_BITWISE = 8
+
+# Operand kinds, tested against each opcode's allowed-kind mask
+_IMMEDIATE = 1
+_DIRECT = 2
+_ACC = 4
+_IX = 8
+
+# opcode -> (flags, allowed operand kinds)
+_OPCODE_INFO: dict[str, tuple[int, int]] = {
+    "LDM": (_NEEDS_OPERAND, _IMMEDIATE | _DIRECT),
+    "LDD": (_NEEDS_OPERAND, _DIRECT),
+    "LDI": (_NEEDS_OPERAND, _DIRECT),
+    "LDX": (_NEEDS_OPERAND, _DIRECT),
+    "LDR": (0, _IMMEDIATE | _DIRECT | _ACC | _IX),
+    "MOV": (0, _IX),
+    "STO": (_NEEDS_OPERAND, _DIRECT),
+    "END": (_NO_OPERAND, 0),
+    "IN": (_NO_OPERAND, 0),
+    "OUT": (_NO_OPERAND, 0),
+    "ADD": (_NEEDS_OPERAND, _IMMEDIATE | _DIRECT),
+    "SUB": (_NEEDS_OPERAND, _IMMEDIATE | _DIRECT),
+    "INC": (0, _ACC | _IX),
+    "DEC": (0, _ACC | _IX),
+    "CMP": (_NEEDS_OPERAND, _IMMEDIATE | _DIRECT),
+    "CMI": (_NEEDS_OPERAND, _DIRECT),
+    "JMP": (_NEEDS_OPERAND, _DIRECT),
+    "JPE": (_NEEDS_OPERAND, _DIRECT),
+    "JPN": (_NEEDS_OPERAND, _DIRECT),
+    "LSL": (_NEEDS_OPERAND | _SHIFT, _IMMEDIATE),
+    "LSR": (_NEEDS_OPERAND | _SHIFT, _IMMEDIATE),
+    "AND": (_NEEDS_OPERAND | _BITWISE, _IMMEDIATE | _DIRECT),
+    "OR": (_NEEDS_OPERAND | _BITWISE, _IMMEDIATE | _DIRECT),
+    "XOR": (_NEEDS_OPERAND | _BITWISE, _IMMEDIATE | _DIRECT),
 }
 
-SHIFT_OPCODES = {"LSL", "LSR"}
-BITWISE_OPCODES = {"AND", "OR", "XOR"}
+# Allowed operand kinds -> error message when an operand does not fit
+_OPERAND_ERRORS = {
+    _IMMEDIATE: "{} requires an immediate operand",
+    _DIRECT: "{} requires a direct address",
+    _IMMEDIATE | _DIRECT: "{} requires an immediate or direct operand",
+    _ACC | _IX: "{} only accepts ACC or IX",
+    _IX: "{} only accepts IX as operand",
+}
+# For masks without their own message; LDR accepts every kind and never uses it
+_DEFAULT_OPERAND_ERROR = "{} does not accept this operand"
 
-# Opcodes that require operand
-OPCODES_WITH_OPERAND = {
-    "LDM",
-    "LDD",
-    "LDI",
-    "LDX",
-    "LDR",
-    "STO",
-    "ADD",
-    "SUB",
-    "CMP",
-    "CMI",
-    "JMP",
-    "JPE",
-    "JPN",
-    "LSL",
-    "LSR",
-    "AND",
-    "OR",
-    "XOR",
+
+def _make_operand_validator(opcode: str, flags: int, allowed: int) -> Callable[[int, int, str], None]:
+    """Build the operand check for one opcode from its _OPCODE_INFO entry.
+
+    The returned function takes the operand kind (0 for no operand), the
+    source line number and the source text, and raises if the operand
+    does not fit the opcode.
+    """
+    template = _OPERAND_ERRORS.get(allowed, _DEFAULT_OPERAND_ERROR)
+    if flags & _NO_OPERAND:
+        error_cls, message = InvalidOperand, f"{opcode} does not take an operand"
+    elif flags & _SHIFT:
+        error_cls, message = OperandTypeError, f"{opcode} requires an immediate shift amount"
+    elif flags & _BITWISE:
+        error_cls, message = OperandTypeError, template.format(opcode)
+    else:
+        error_cls, message = InvalidOperand, template.format(opcode)
+    needs_operand = bool(flags & _NEEDS_OPERAND)
+    missing_message = f"{opcode} requires an operand"
+
+    def validate(kind: int, line_no: int, source_text: str) -> None:
+        if kind & allowed:
+            return
+        if kind:
+            raise error_cls(message, source_line_no=line_no, source_text=source_text)
+        if needs_operand:
+            raise InvalidOperand(missing_message, source_line_no=line_no, source_text=source_text)
+
+    return validate
+
+
+# opcode -> (op_id, operand validator), everything _parse_instruction needs in one lookup
+_OPCODE_META: dict[str, tuple[int, Callable[[int, int, str], None]]] = {
+    opcode: (OPCODE_TO_ID[opcode], _make_operand_validator(opcode, flags, allowed))
+    for opcode, (flags, allowed) in _OPCODE_INFO.items()
 }
 
-# Opcodes with optional/register operand
-OPCODES_WITH_REGISTER_OPERAND = {"INC", "DEC", "LDR", "MOV"}
+_BINARY_DIGITS = frozenset("01")
 
-# Opcodes with no operand
-OPCODES_NO_OPERAND = {"IN", "OUT", "END"}
 
-_DECIMAL_LITERAL_RE = re.compile(r"^\d+$")
-_BINARY_LITERAL_RE = re.compile(r"^[01]+$")
+class OperandType(IntEnum):
+    """How an instruction's operand is addressed."""
+    NONE = 0
+    IMMEDIATE = 1  # #n
+    DIRECT = 2  # Address or label
+    REGISTER = 3  # ACC or IX
 
 
-@dataclass
+@dataclass(slots=True)
 class Instruction:
     """Parsed instruction with metadata."""
     addr: int
     opcode: str
     operand: Optional[str]  # Raw operand string
     operand_value: Optional[int]  # Resolved numeric value
-    operand_type: str  # "immediate", "direct", "register", "none"
+    operand_type: OperandType
+    operand_upper: Optional[str]  # Upper-cased label name for label operands
     source_line_no: int
     source_text: str
     clean_text: str
+    ir_text: str  # "OPCODE operand", loaded into the CPU's IR when traced
+    op_id: int  # Index into OPCODE_NAMES
+    next_pc: int  # Fall-through address when the instruction does not jump
+    handler: Optional[Callable] = field(default=None, repr=False, compare=False)  # Bound executor
+    flag_defined: bool = False  # Compare flag proven set whenever this executes
+    steps: int = 1  # Source instructions covered (>1 for superinstructions)
+    jump_target: Optional[int] = None  # Branch target of a fused compare-and-jump
+
+
+@dataclass(slots=True)
+class Block:
+    """Straight-line run of instructions entered only at its first address."""
+    instructions: tuple[Instruction, ...]
+    steps: int  # Source instructions covered
+    next_pc: int  # Fall-through address after the last instruction
+    ops: tuple[tuple[Callable, Instruction], ...] = ()  # (executor, instruction) once bound
 
+    def steps_before(self, instr: Instruction) -> int:
+        """Count the source steps executed in this block before `instr`."""
+        count = 0
+        for item in self.instructions:
+            if item is instr:
+                break
+            count += item.steps
+        return count
 
-@dataclass
+
+@dataclass(slots=True)
 class ParsedProgram:
     """Result of parsing a program."""
     instructions: dict[int, Instruction]  # addr -> instruction
@@ -98,6 +239,8 @@ class ParsedProgram:
     initial_memory: dict[int, int]  # addr -> value (data)
     start_address: int
     end_address: int
+    fused: dict[int, Instruction] = field(default_factory=dict)  # addr -> superinstruction
+    blocks: dict[int, Block] = field(default_factory=dict)  # leader addr -> block
 
 
 def parse_program(
@@ -116,77 +259,55 @@ def parse_program(
         ParsedProgram with instructions and labels
     """
     instructions: dict[int, Instruction] = {}
+    unresolved: list[Instruction] = []  # Operands naming labels not yet seen
     initial_memory: dict[int, int] = {}
     resolved_labels: dict[str, int] = labels.copy() if labels else {}
     
-    lines = text.split("\n")
+    # Mixed mode is allowed: sequential addresses follow the last explicit one.
     current_addr = start_address
-    has_explicit_addresses = False
-    has_sequential_addresses = False
     
-    # First pass: collect labels and detect address mode
-    for line_no, line in enumerate(lines, 1):
-        stripped = _strip_comment(line).strip()
+    for line_no, line in enumerate(text.splitlines(), 1):
+        # Drop any ";" comment; lines without one are their own source text
+        comment = line.find(";")
+        stripped = (line if comment < 0 else line[:comment]).strip()
         if not stripped:
             continue
+        original_text = stripped if comment < 0 else line.strip()
         
         # 1. Extract optional Address prefix
         # Supports "200 LDD 81" or "200: LDD 81" or "80 10"
-        addr_match = re.match(r"^(\d+)(?:\s*:\s*|\s+)(.*)$", stripped)
-        if addr_match:
-            has_explicit_addresses = True
-            rest = addr_match.group(2).strip()
-        else:
-            has_sequential_addresses = True
-            rest = stripped
+        addr = current_addr
+        instruction_text = stripped
+        digits = len(stripped) - len(stripped.lstrip("0123456789"))
+        if digits:
+            after = stripped[digits:].lstrip()
+            if after[:1] == ":":
+                addr = int(stripped[:digits])
+                instruction_text = after[1:].lstrip()
+            elif len(after) < len(stripped) - digits:
+                addr = int(stripped[:digits])
+                instruction_text = after
         
         # 2. Extract optional Label prefix from the remaining text
         # Supports "START: LDD 81" or "START: 10"
-        label_match = re.match(r"^([A-Za-z_][A-Za-z0-9_]*):\s*(.*)$", rest)
-        if label_match:
-            label_name = label_match.group(1).upper()
-            if label_name in resolved_labels:
-                raise AddressConflict(
-                    f"Duplicate label: {label_name}",
-                    source_line_no=line_no,
-                    source_text=line.strip(),
-                )
-            # Address resolution happens in Pass 2
-    
-    # Mixed mode is allowed: sequential addresses follow the last explicit one.
-    
-    # Second pass: parse instructions
-    current_addr = start_address
-    
-    for line_no, line in enumerate(lines, 1):
-        stripped = _strip_comment(line).strip()
-        if not stripped:
-            continue
-        
-        original_text = line.strip()
-        # 1. Extract optional Address prefix
-        addr_match = re.match(r"^(\d+)(?:\s*:\s*|\s+)(.*)$", stripped)
-        if addr_match:
-            addr = int(addr_match.group(1))
-            instruction_text = addr_match.group(2).strip()
-        else:
-            addr = current_addr
-            instruction_text = stripped
-        
-        # 2. Extract optional Label prefix from the remaining text
-        label_match = re.match(r"^([A-Za-z_][A-Za-z0-9_]*):\s*(.*)$", instruction_text)
-        if label_match:
-            label_name = label_match.group(1).upper()
-            resolved_labels[label_name] = addr
-            instruction_text = label_match.group(2).strip()
+        colon = instruction_text.find(":")
+        if colon > 0:
+            label_name = instruction_text[:colon]
+            if label_name.isidentifier() and label_name.isascii():
+                label_name = label_name.upper()
+                if label_name in resolved_labels:
+                    raise AddressConflict(
+                        f"Duplicate label: {label_name}",
+                        source_line_no=line_no,
+                        source_text=original_text,
+                    )
+                resolved_labels[label_name] = addr
+                instruction_text = instruction_text[colon + 1:].lstrip()
             
         # 3. Check if the remaining text is just a number (data initialization)
         if not instruction_text:
             # Address/Label only line
-            if not has_explicit_addresses:
-                current_addr += 1
-            else:
-                current_addr = addr + 1
+            current_addr = addr + 1
             continue
 
         data_value = _try_parse_numeric_literal(instruction_text, line_no, original_text)
@@ -208,36 +329,31 @@ def parse_program(
             )
         
         instructions[addr] = instruction
-        
-        if not has_explicit_addresses:
-            current_addr += 1
-        else:
-            current_addr = addr + 1
+        if instruction.operand_type == OperandType.DIRECT and instruction.operand_value is None:
+            unresolved.append(instruction)
+        current_addr = addr + 1
     
     if not instructions:
         raise ParseError("Program contains no instructions")
     
-    # Third pass: resolve label references in operands
-    for addr, instr in instructions.items():
-        if instr.operand and instr.operand_value is None and instr.operand_type == "direct":
-            label = instr.operand.upper()
-            if label in resolved_labels:
-                instr.operand_value = resolved_labels[label]
-            else:
-                raise InvalidOperand(
-                    f"Unknown label: {instr.operand}",
-                    source_line_no=instr.source_line_no,
-                    source_text=instr.source_text,
-                )
+    # Second pass: resolve label references defined after their use
+    for instr in unresolved:
+        label = instr.operand_upper
+        if label in resolved_labels:
+            instr.operand_value = resolved_labels[label]
+        else:
+            raise InvalidOperand(
+                f"Unknown label: {instr.operand}",
+                source_line_no=instr.source_line_no,
+                source_text=instr.source_text,
+            )
     
-    addresses = sorted(instructions.keys())
-    if not addresses:
-        # If only memory init, use 0 or something safe as start
-        start_addr = 0
-        end_addr = 0
-    else:
-        start_addr = addresses[0]
-        end_addr = addresses[-1]
+    start_addr = min(instructions)
+    end_addr = max(instructions)
+
+    _mark_flag_defined(instructions, start_addr)
+    fused = _fuse_compare_jumps(instructions)
+    fused.update(_fuse_memory_updates(instructions))
 
     return ParsedProgram(
         instructions=instructions,
@@ -245,15 +361,163 @@ def parse_program(
         initial_memory=initial_memory,
         start_address=start_addr,
         end_address=end_addr,
+        fused=fused,
+        blocks=_build_blocks(instructions, fused, start_addr),
     )
 
 
-def _strip_comment(line: str) -> str:
-    """Remove comment from line."""
-    idx = line.find(";")
-    if idx >= 0:
-        return line[:idx]
-    return line
+def _successors(instr: Instruction) -> tuple[int, ...]:
+    """Return the addresses control can reach after an instruction."""
+    if instr.op_id == OP_END:
+        return ()
+    if instr.op_id == OP_JMP:
+        return (instr.operand_value,)
+    if instr.op_id in (OP_JPE, OP_JPN):
+        return (instr.addr + 1, instr.operand_value)
+    return (instr.addr + 1,)
+
+
+def _mark_flag_defined(instructions: dict[int, Instruction], entry: int) -> None:
+    """Mark instructions that can only be reached after a CMP or CMI.
+
+    Forward must-analysis over the control-flow graph: the flag is defined
+    on entry to an instruction when it is defined on exit from every
+    predecessor, and CMP/CMI define it on exit. Nothing clears the flag.
+    """
+    predecessors: dict[int, list[int]] = {addr: [] for addr in instructions}
+    for addr, instr in instructions.items():
+        for succ in _successors(instr):
+            if succ in predecessors:
+                predecessors[succ].append(addr)
+
+    # Start optimistic and only ever lower entries until a fixpoint is reached
+    defined_in = {addr: addr != entry for addr in instructions}
+    worklist = sorted(instructions)
+    while worklist:
+        addr = worklist.pop()
+        if addr == entry or not defined_in[addr]:
+            continue
+        for pred in predecessors[addr]:
+            pred_instr = instructions[pred]
+            if not defined_in[pred] and pred_instr.op_id not in (OP_CMP, OP_CMI):
+                defined_in[addr] = False
+                worklist.extend(
+                    succ for succ in _successors(instructions[addr]) if succ in instructions
+                )
+                break
+
+    for addr, instr in instructions.items():
+        instr.flag_defined = defined_in[addr]
+
+
+def _jump_targets(instructions: dict[int, Instruction]) -> set[int]:
+    """Return the addresses named by JMP, JPE and JPN."""
+    return {
+        instr.operand_value
+        for instr in instructions.values()
+        if instr.op_id in (OP_JMP, OP_JPE, OP_JPN)
+    }
+
+
+def _fuse_compare_jumps(instructions: dict[int, Instruction]) -> dict[int, Instruction]:
+    """Build CMP+JPE/JPN superinstructions, keyed by the CMP address.
+
+    A pair is only fused when nothing jumps to the conditional jump itself,
+    so control can only reach it through the compare.
+    """
+    jump_targets = _jump_targets(instructions)
+    fused: dict[int, Instruction] = {}
+    for addr, instr in instructions.items():
+        if instr.op_id != OP_CMP:
+            continue
+        jump = instructions.get(addr + 1)
+        if jump is None or jump.op_id not in (OP_JPE, OP_JPN) or jump.addr in jump_targets:
+            continue
+        op_id = OP_CMPJPE if jump.op_id == OP_JPE else OP_CMPJPN
+        fused[addr] = replace(
+            instr,
+            opcode=FUSED_OPCODE_NAMES[op_id - len(OPCODE_NAMES)],
+            op_id=op_id,
+            handler=None,
+            next_pc=addr + 2,
+            steps=2,
+            jump_target=jump.operand_value,
+        )
+    return fused
+
+
+def _fuse_memory_updates(instructions: dict[int, Instruction]) -> dict[int, Instruction]:
+    """Build LDD a; INC/DEC ACC; STO a superinstructions, keyed by the LDD address.
+
+    Like compare-and-jump fusion, the INC/DEC and STO must not be jump
+    targets, so the sequence can only be entered at the LDD.
+    """
+    jump_targets = _jump_targets(instructions)
+    fused: dict[int, Instruction] = {}
+    for addr, instr in instructions.items():
+        if instr.op_id != OP_LDD:
+            continue
+        step = instructions.get(addr + 1)
+        store = instructions.get(addr + 2)
+        if (
+            step is None
+            or store is None
+            or step.op_id not in (OP_INC, OP_DEC)
+            or step.operand == "IX"
+            or store.op_id != OP_STO
+            or store.operand_value != instr.operand_value
+            or step.addr in jump_targets
+            or store.addr in jump_targets
+        ):
+            continue
+        op_id = OP_INCMEM if step.op_id == OP_INC else OP_DECMEM
+        fused[addr] = replace(
+            instr,
+            opcode=FUSED_OPCODE_NAMES[op_id - len(OPCODE_NAMES)],
+            op_id=op_id,
+            handler=None,
+            next_pc=addr + 3,
+            steps=3,
+        )
+    return fused
+
+
+def _build_blocks(
+    instructions: dict[int, Instruction],
+    fused: dict[int, Instruction],
+    entry: int,
+) -> dict[int, Block]:
+    """Split the program into basic blocks, preferring superinstructions.
+
+    Blocks start at the entry point, at every jump target and after every
+    control-flow instruction, and end at a control-flow instruction, before
+    the next block start, or before a gap in the instruction addresses.
+    """
+    leaders = {entry}
+    for addr, instr in instructions.items():
+        if instr.op_id in CONTROL_OPS:
+            leaders.add(addr + 1)
+            if instr.op_id != OP_END:
+                leaders.add(instr.operand_value)
+
+    blocks: dict[int, Block] = {}
+    for leader in sorted(leaders):
+        if leader not in instructions:
+            continue
+        items: list[Instruction] = []
+        addr = leader
+        while True:
+            instr = fused.get(addr) or instructions[addr]
+            items.append(instr)
+            addr = instr.next_pc
+            if instr.op_id in CONTROL_OPS or addr in leaders or addr not in instructions:
+                break
+        blocks[leader] = Block(
+            instructions=tuple(items),
+            steps=sum(item.steps for item in items),
+            next_pc=addr,
+        )
+    return blocks
 
 
 def _parse_instruction(
@@ -273,33 +537,40 @@ def _parse_instruction(
             source_text=original_text,
         )
     
-    opcode = parts[0].upper()
+    opcode = sys.intern(parts[0].upper())
     operand_str = parts[1].strip() if len(parts) > 1 else None
     
-    if opcode not in VALID_OPCODES:
+    meta = _OPCODE_META.get(opcode)
+    if meta is None:
         raise UnknownOpcode(
             f"Unknown opcode: {opcode}",
             source_line_no=line_no,
             source_text=original_text,
         )
+    op_id, validate = meta
     
     # Parse operand
     operand_value = None
-    operand_type = "none"
+    operand_type = OperandType.NONE
+    kind = 0
+    operand_upper = None
     
     if operand_str:
-        operand_str_upper = operand_str.upper()
+        # The first character tells the operand forms apart; labels cannot
+        # start with a digit or sign
+        first = operand_str[0]
         
         # Immediate value: #n
-        if operand_str.startswith("#"):
-            operand_type = "immediate"
+        if first == "#":
+            operand_type = OperandType.IMMEDIATE
+            kind = _IMMEDIATE
             literal_text = operand_str[1:]
             try:
                 operand_value = _parse_numeric_literal(literal_text, line_no, original_text)
             except InvalidBinaryLiteral:
                 raise
             except ValueError:
-                if opcode in SHIFT_OPCODES:
+                if _OPCODE_INFO[opcode][0] & _SHIFT:
                     raise InvalidShiftAmount(
                         f"{opcode} requires a numeric immediate shift amount",
                         source_line_no=line_no,
@@ -311,15 +582,10 @@ def _parse_instruction(
                     source_text=original_text,
                 )
         
-        # Register operand: ACC, IX
-        elif operand_str_upper in ("ACC", "IX"):
-            operand_type = "register"
-            operand_str = operand_str_upper
-        
-        # Direct address or label
-        else:
-            operand_type = "direct"
-            # Try to parse as number
+        # Direct address
+        elif first.isdecimal() or first in "+-":
+            operand_type = OperandType.DIRECT
+            kind = _DIRECT
             try:
                 operand_value = _parse_numeric_literal(
                     operand_str,
@@ -327,72 +593,34 @@ def _parse_instruction(
                     original_text,
                     allow_binary=False,
                 )
-            except InvalidBinaryLiteral:
-                raise
             except ValueError:
-                if operand_str_upper in labels:
-                    operand_value = labels[operand_str_upper]
-                # else: leave as None, will be resolved later
-    
-    # Validate operand requirements
-    if opcode in OPCODES_NO_OPERAND and operand_str:
-        raise InvalidOperand(
-            f"{opcode} does not take an operand",
-            source_line_no=line_no,
-            source_text=original_text,
-        )
-    
-    if opcode in OPCODES_WITH_OPERAND and opcode not in OPCODES_WITH_REGISTER_OPERAND:
-        if not operand_str:
-            raise InvalidOperand(
-                f"{opcode} requires an operand",
-                source_line_no=line_no,
-                source_text=original_text,
-            )
-        
-        # Check operand type validity
-        if opcode in ("LDM", "LDR") and operand_type == "immediate":
-            pass  # Valid: LDM #n, LDR #n
-        elif opcode == "LDR" and operand_type == "register" and operand_str == "ACC":
-            pass  # Valid: LDR ACC
-        elif opcode in ("ADD", "SUB", "CMP") and operand_type in ("immediate", "direct"):
-            pass  # Valid: ADD #n, ADD a, SUB #n, SUB a, CMP #n, CMP a
-        elif opcode in BITWISE_OPCODES:
-            if operand_type not in ("immediate", "direct"):
-                raise OperandTypeError(
-                    f"{opcode} requires an immediate or direct operand",
-                    source_line_no=line_no,
-                    source_text=original_text,
-                )
-        elif opcode in SHIFT_OPCODES:
-            if operand_type != "immediate":
-                raise OperandTypeError(
-                    f"{opcode} requires an immediate shift amount",
-                    source_line_no=line_no,
-                    source_text=original_text,
-                )
-        elif opcode in ("LDD", "LDI", "LDX", "STO", "CMI", "JMP", "JPE", "JPN"):
-            if operand_type != "direct":
                 raise InvalidOperand(
-                    f"{opcode} requires a direct address",
+                    f"Invalid address: {operand_str}",
                     source_line_no=line_no,
                     source_text=original_text,
                 )
+        
+        else:
+            operand_str_upper = operand_str.upper()
+            
+            # Register operand: ACC, IX (stored as the shared literals)
+            if operand_str_upper == "ACC":
+                operand_type = OperandType.REGISTER
+                kind = _ACC
+                operand_str = "ACC"
+            elif operand_str_upper == "IX":
+                operand_type = OperandType.REGISTER
+                kind = _IX
+                operand_str = "IX"
+            
+            # Label, None if defined further down; resolved after parsing
+            else:
+                operand_type = OperandType.DIRECT
+                kind = _DIRECT
+                operand_upper = operand_str_upper
+                operand_value = labels.get(operand_upper)
     
-    if opcode in OPCODES_WITH_REGISTER_OPERAND:
-        if operand_str:
-            if opcode == "MOV" and operand_str != "IX":
-                raise InvalidOperand(
-                    f"MOV only accepts IX as operand",
-                    source_line_no=line_no,
-                    source_text=original_text,
-                )
-            if opcode in ("INC", "DEC") and operand_str not in ("ACC", "IX"):
-                raise InvalidOperand(
-                    f"{opcode} only accepts ACC or IX",
-                    source_line_no=line_no,
-                    source_text=original_text,
-                )
+    validate(kind, line_no, original_text)
     
     return Instruction(
         addr=addr,
@@ -400,9 +628,13 @@ def _parse_instruction(
         operand=operand_str,
         operand_value=operand_value,
         operand_type=operand_type,
+        operand_upper=operand_upper,
         source_line_no=line_no,
         source_text=original_text,
         clean_text=clean_text,
+        ir_text=opcode if operand_str is None else f"{opcode} {operand_str}",
+        op_id=op_id,
+        next_pc=addr + 1,
     )
 
 
@@ -449,7 +681,7 @@ def _parse_numeric_literal(
 
     if allow_binary and literal[0] in "Bb":
         bits = literal[1:]
-        if not bits or not _BINARY_LITERAL_RE.fullmatch(bits):
+        if not bits or not _BINARY_DIGITS.issuperset(bits):
             raise InvalidBinaryLiteral(
                 f"Invalid binary literal: {text}",
                 source_line_no=line_no,
@@ -457,7 +689,7 @@ def _parse_numeric_literal(
             )
         value = int(bits, 2)
     else:
-        if not _DECIMAL_LITERAL_RE.fullmatch(literal):
+        if not literal.isdecimal():
             raise ValueError("Invalid decimal literal")
         value = int(literal, 10)
 
@@ -1,11 +1,14 @@
 """Program runner with tracing for Cambridge Assembly Emulator."""
 
+import hashlib
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Optional, Callable
 from .cpu import CPU
 from .memory import Memory
-from .parser import parse_program, ParsedProgram, Instruction
-from .instructions import execute_instruction, IOBuffer
+from .parser import parse_program, ParsedProgram, Instruction, OperandType, OP_STO
+from .instructions import bind_program, IOBuffer
 from .errors import (
     CASMError,
     CASMRuntimeError,
@@ -14,7 +17,7 @@ from .errors import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class RunOptions:
     """Options for program execution."""
     memory_size: int = 256
@@ -28,58 +31,19 @@ class RunOptions:
     trace_include_flag: bool = False
     trace_include_io: bool = True
     trace_value_format: str = "dec"
+    trace_max_entries: Optional[int] = None  # Cap on trace rows; later steps run untraced
     initial_memory: dict[int, int] = field(default_factory=dict)
+    track_ir: bool = False  # Keep cpu.ir on the executing instruction (traced runs)
 
 
-@dataclass
-class TraceRow:
-    """Single row of execution trace."""
-    step: int
-    addr: int
-    acc: int
-    mem: dict[str, int]
-    ix: Optional[int] = None
-    flag: Optional[bool] = None
-    in_code: Optional[int] = None
-    out_code: Optional[int] = None
-    instr_text: str = ""
-    label: Optional[str] = None
-
-    def to_dict(
-        self,
-        include_ix: bool,
-        include_flag: bool,
-        include_io: bool,
-        value_formatter: Optional[Callable[[int], object]] = None,
-    ) -> dict:
-        acc_value = value_formatter(self.acc) if value_formatter else self.acc
-        mem_values = (
-            {addr: value_formatter(val) for addr, val in self.mem.items()}
-            if value_formatter
-            else self.mem
-        )
-        result = {
-            "step": self.step,
-            "addr": self.addr,
-            "acc": acc_value,
-            "mem": mem_values,
-        }
-        if include_ix:
-            result["ix"] = self.ix
-        if include_flag:
-            result["flag"] = self.flag
-        if include_io:
-            result["in_code"] = self.in_code
-            result["out_code"] = self.out_code
-        result["instr_text"] = self.instr_text
-        if self.label:
-            result["label"] = self.label
-        return result
-
-
-@dataclass
+@dataclass(slots=True)
 class RunResult:
-    """Result of program execution."""
+    """Result of program execution.
+
+    Consecutive trace rows share one "mem" dict until a STO changes a
+    watched address, so treat the rows as read-only (copy a row's "mem"
+    before modifying it).
+    """
     status: str  # "ok" | "error"
     output_text: str
     steps_executed: int
@@ -87,6 +51,7 @@ class RunResult:
     trace_watch: list[int]
     trace: list[dict]
     error: Optional[ErrorInfo] = None
+    trace_truncated: bool = False
 
     def to_dict(self) -> dict:
         result = {
@@ -96,6 +61,7 @@ class RunResult:
             "final_state": self.final_state,
             "trace_watch": self.trace_watch,
             "trace": self.trace,
+            "trace_truncated": self.trace_truncated,
         }
         if self.error:
             result["error"] = self.error.to_dict()
@@ -120,6 +86,36 @@ def _make_trace_value_formatter(
     return formatter
 
 
+# Parsed programs kept between runs, keyed by a digest of the source so the
+# cache never holds program text; small because a server sees many sources
+_PROGRAM_CACHE_SIZE = 16
+_program_cache: "OrderedDict[tuple[bytes, int], ParsedProgram]" = OrderedDict()
+_program_cache_lock = threading.Lock()
+
+
+def _load_program(program_text: str, start_address: int) -> ParsedProgram:
+    """Parse a program and bind its executors.
+
+    Cached so re-running the same source (e.g. with different input) skips
+    parsing; runs only read the ParsedProgram, never modify it.
+    """
+    digest = hashlib.blake2b(program_text.encode("utf-8", "surrogatepass"), digest_size=16)
+    key = (digest.digest(), start_address)
+    with _program_cache_lock:
+        program = _program_cache.get(key)
+        if program is not None:
+            _program_cache.move_to_end(key)
+            return program
+    program = parse_program(program_text, start_address=start_address)
+    # Resolve executors once so the step loop never dispatches on opcode strings
+    bind_program(program)
+    with _program_cache_lock:
+        _program_cache[key] = program
+        if len(_program_cache) > _PROGRAM_CACHE_SIZE:
+            _program_cache.popitem(last=False)
+    return program
+
+
 def run_program(
     program_text: str,
     input_text: str = "",
@@ -162,14 +158,14 @@ def run_program(
     
     # Parse program
     try:
-        program = parse_program(program_text, start_address=options.start_address)
+        program = _load_program(program_text, options.start_address)
     except CASMError as e:
         return RunResult(
             status="error",
             output_text="",
             steps_executed=0,
             final_state=cpu.get_state(),
-            trace_watch=options.trace_watch,
+            trace_watch=list(options.trace_watch),
             trace=[],
             error=e.to_error_info(),
         )
@@ -177,23 +173,22 @@ def run_program(
     # Merge initial memory from program code
     for addr, val in program.initial_memory.items():
         memory.write(addr, val)
-        if addr not in options.trace_watch:
-            options.trace_watch.append(addr)
     
     # Merge initial memory from options (takes precedence over program code)
     for addr, val in options.initial_memory.items():
         memory.write(addr, val)
-        if addr not in options.trace_watch:
-            options.trace_watch.append(addr)
     
-    # Auto-watch addresses referenced in instructions (direct addressing)
-    for addr, instr in program.instructions.items():
-        if instr.operand_type == "direct" and instr.operand_value is not None:
-            target_addr = instr.operand_value
-            if target_addr not in options.trace_watch:
-                options.trace_watch.append(target_addr)
-    
-    options.trace_watch.sort()
+    # Watch requested addresses, initialised data and direct operands
+    # (collected in a set; the caller's options are left untouched)
+    watch = set(options.trace_watch)
+    watch.update(program.initial_memory)
+    watch.update(options.initial_memory)
+    watch.update(
+        instr.operand_value
+        for instr in program.instructions.values()
+        if instr.operand_type == OperandType.DIRECT and instr.operand_value is not None
+    )
+    trace_watch = sorted(watch)
     
     # Pre-calculate address-to-label mapping for fast lookup
     addr_to_label = {addr: name for name, addr in program.labels.items()}
@@ -201,84 +196,154 @@ def run_program(
     # Set starting PC
     cpu.pc = program.start_address
     
+    # Watched memory as of the current step, as shown in trace rows. Only STO
+    # writes memory, so the traced loop replaces the view after a STO to a
+    # watched address; rows in between share the same dict.
+    watched = memory.get_watched(trace_watch) if options.trace else {}
+    watched_keys = {int(key): key for key in watched}
+    if value_formatter is not None:
+        watched = {key: value_formatter(val) for key, val in watched.items()}
+    
+    include_ix = options.trace_include_ix
+    include_flag = options.trace_include_flag
+    include_io = options.trace_include_io
+
+    io_seen = 0
+
+    def record(step: int, addr: int, instr_text: str) -> None:
+        """Append a trace row dict built straight from the machine state."""
+        nonlocal io_seen
+        acc = cpu.acc if value_formatter is None else value_formatter(cpu.acc)
+        row = {"step": step, "addr": addr, "acc": acc, "mem": watched}
+        if include_ix:
+            row["ix"] = cpu.ix
+        if include_flag:
+            row["flag"] = cpu.get_flag()
+        if include_io:
+            # Only report codes from I/O done since the previous row
+            if io_buffer.io_count != io_seen:
+                io_seen = io_buffer.io_count
+                row["in_code"] = io_buffer.last_in_code
+                row["out_code"] = io_buffer.last_out_code
+            else:
+                row["in_code"] = None
+                row["out_code"] = None
+        row["instr_text"] = instr_text
+        label = addr_to_label.get(addr)
+        if label:
+            row["label"] = label
+        trace_rows.append(row)
+
     # Record Initial State (Step 0)
     if options.trace:
-        row = TraceRow(
-            step=0,
-            addr=cpu.pc,
-            acc=cpu.acc,
-            mem=memory.get_watched(options.trace_watch),
-            ix=cpu.ix if options.trace_include_ix else None,
-            flag=cpu.flag if options.trace_include_flag else None,
-            in_code=None,
-            out_code=None,
-            instr_text="Initial State",
-            label=addr_to_label.get(cpu.pc),
-        )
-        trace_rows.append(row.to_dict(
-            include_ix=options.trace_include_ix,
-            include_flag=options.trace_include_flag,
-            include_io=options.trace_include_io,
-            value_formatter=value_formatter,
-        ))
+        record(0, cpu.pc, "Initial State")
 
     current_instr: Optional[Instruction] = None
     
+    max_steps = options.max_steps
+    fetch = program.instructions.get
+    track_ir = options.track_ir
+    
+    # Steps that get a trace row; the initial state takes one of the entries
+    traced_steps = max_steps if options.trace else 0
+    if options.trace and options.trace_max_entries is not None:
+        traced_steps = min(traced_steps, max(options.trace_max_entries - 1, 0))
+    
     try:
-        while not cpu.halted and steps_executed < options.max_steps:
+        while not cpu.halted and steps_executed < traced_steps:
             # Fetch instruction
-            if cpu.pc not in program.instructions:
+            next_instr = fetch(cpu.pc)
+            if next_instr is None:
                 raise CASMRuntimeError(
                     f"No instruction at address {cpu.pc}",
                     step=steps_executed + 1,
                     addr=cpu.pc,
                 )
             
-            current_instr = program.instructions[cpu.pc]
-            cpu.ir = f"{current_instr.opcode} {current_instr.operand or ''}".strip()
+            current_instr = next_instr
+            if track_ir:
+                cpu.ir = current_instr.ir_text
             
             # Store current PC before execution (for trace)
             instr_addr = cpu.pc
             
-            # Reset I/O codes for this instruction
-            io_buffer.reset_io_codes()
-            
-            # Execute
-            new_pc = execute_instruction(current_instr, cpu, memory, io_buffer)
+            # Execute via the bound executor (no per-step dispatch)
+            new_pc = current_instr.handler(current_instr, cpu, memory, io_buffer)
             
             # Update PC
             if new_pc is not None:
                 cpu.pc = new_pc
             else:
-                cpu.pc = cpu.pc + 1
+                cpu.pc = current_instr.next_pc
             
             steps_executed += 1
             
-            # Record trace
-            if options.trace:
-                row = TraceRow(
-                    step=steps_executed,
-                    addr=instr_addr,
-                    acc=cpu.acc,
-                    mem=memory.get_watched(options.trace_watch),
-                    ix=cpu.ix if options.trace_include_ix else None,
-                    flag=cpu.flag if options.trace_include_flag else None,
-                    in_code=io_buffer.last_in_code if options.trace_include_io else None,
-                    out_code=io_buffer.last_out_code if options.trace_include_io else None,
-                    instr_text=current_instr.clean_text if current_instr else "",
-                    label=addr_to_label.get(instr_addr),
-                )
-                trace_rows.append(row.to_dict(
-                    include_ix=options.trace_include_ix,
-                    include_flag=options.trace_include_flag,
-                    include_io=options.trace_include_io,
-                    value_formatter=value_formatter,
-                ))
+            if current_instr.op_id == OP_STO:
+                key = watched_keys.get(current_instr.operand_value)
+                if key is not None:
+                    value = memory.read(current_instr.operand_value)
+                    if value_formatter is not None:
+                        value = value_formatter(value)
+                    # Copy on write: earlier rows keep the previous view
+                    watched = {**watched, key: value}
+            
+            record(steps_executed, instr_addr, current_instr.clean_text)
+
+        if not cpu.halted and steps_executed < max_steps:
+            # Untraced runs (and traced runs past trace_max_entries) execute
+            # whole basic blocks (with superinstructions) while they end
+            # before the step budget does. Off a block leader (a trace cap
+            # can stop mid-block) or near the budget they single-step, going
+            # back to blocks at the next leader. The PC is kept in a local
+            # and written back when the loop ends or an error escapes.
+            blocks = program.blocks
+            pc = cpu.pc
+            try:
+                while True:
+                    while not cpu.halted:
+                        block = blocks.get(pc)
+                        # A block that would use up the budget is single-stepped,
+                        # so a step-limit error names the last source instruction run
+                        if block is None or steps_executed + block.steps >= max_steps:
+                            break
+                        try:
+                            for handler, current_instr in block.ops:
+                                new_pc = handler(current_instr, cpu, memory, io_buffer)
+                        except CASMError:
+                            steps_executed += block.steps_before(current_instr)
+                            pc = current_instr.addr
+                            raise
+                        steps_executed += block.steps
+                        pc = block.next_pc if new_pc is None else new_pc
+
+                    while not cpu.halted and steps_executed < max_steps:
+                        next_instr = fetch(pc)
+                        if next_instr is None:
+                            if current_instr is not None and current_instr.steps > 1:
+                                # A superinstruction ran to completion: the failed
+                                # fetch follows its last source instruction
+                                current_instr = fetch(current_instr.next_pc - 1)
+                            raise CASMRuntimeError(
+                                f"No instruction at address {pc}",
+                                step=steps_executed + 1,
+                                addr=pc,
+                            )
+                        
+                        current_instr = next_instr
+                        new_pc = current_instr.handler(current_instr, cpu, memory, io_buffer)
+                        pc = current_instr.next_pc if new_pc is None else new_pc
+                        steps_executed += 1
+                        if pc in blocks:
+                            break
+                    else:
+                        break
+            finally:
+                cpu.pc = pc
         
         # Check step limit
-        if steps_executed >= options.max_steps and not cpu.halted:
+        if steps_executed >= max_steps and not cpu.halted:
             raise StepLimitExceeded(
-                f"Step limit exceeded: {options.max_steps}",
+                f"Step limit exceeded: {max_steps}",
                 step=steps_executed,
                 addr=cpu.pc,
             )
@@ -297,7 +362,8 @@ def run_program(
         output_text=io_buffer.get_output(),
         steps_executed=steps_executed,
         final_state=cpu.get_state(),
-        trace_watch=options.trace_watch,
+        trace_watch=trace_watch,
         trace=trace_rows,
         error=error_info,
+        trace_truncated=options.trace and steps_executed > traced_steps,
     )
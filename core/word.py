@@ -0,0 +1,26 @@
+"""Word-width helpers shared by the CPU and memory models."""
+
+from typing import Callable
+
+
+def make_normalizer(word_bits: int, signed: bool) -> Callable[[int], int]:
+    """Build a function that normalizes values to a word width and signedness.
+
+    The bounds are captured in the closure once, so each call does the
+    mask and sign adjustment without any attribute lookups.
+    """
+    mask = (1 << word_bits) - 1
+
+    if not signed:
+        def normalize_unsigned(value: int) -> int:
+            return value & mask
+
+        return normalize_unsigned
+
+    sign_bit = 1 << (word_bits - 1)
+
+    def normalize_signed(value: int) -> int:
+        # Branchless sign extension: flip the sign bit, then subtract it
+        return ((value & mask) ^ sign_bit) - sign_bit
+
+    return normalize_signed
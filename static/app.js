@@ -244,7 +244,9 @@ async function runProgram() {
         resultsSection.classList.remove('hidden');
 
         // Badge
-        stepsBadge.textContent = `${result.steps_executed} steps`;
+        stepsBadge.textContent = result.trace_truncated
+            ? `${result.steps_executed} steps (trace shows first ${result.trace.length - 1})`
+            : `${result.steps_executed} steps`;
         stepsBadge.className = 'badge ' + (result.status === 'ok' ? 'success' : 'error');
 
         // Error
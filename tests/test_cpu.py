@@ -1,7 +1,7 @@
 """Tests for the CPU module."""
 
 import pytest
-from core.cpu import CPU
+from core.cpu import CPU, FLAG_TRUE, FLAG_UNDEFINED
 
 
 class TestCPU:
@@ -13,7 +13,8 @@ class TestCPU:
         assert cpu.acc == 0
         assert cpu.ix == 0
         assert cpu.pc == 0
-        assert cpu.flag is None
+        assert cpu.flag == FLAG_UNDEFINED
+        assert cpu.get_state()["flag"] is None
         assert cpu.halted is False
 
     def test_set_acc(self):
@@ -48,7 +49,7 @@ class TestCPU:
         cpu.acc = 10
         cpu.ix = 5
         cpu.pc = 200
-        cpu.flag = True
+        cpu.flag = FLAG_TRUE
         state = cpu.get_state()
         assert state == {"acc": 10, "ix": 5, "pc": 200, "flag": True}
 
@@ -58,11 +59,21 @@ class TestCPU:
         cpu.acc = 100
         cpu.ix = 50
         cpu.pc = 250
-        cpu.flag = True
+        cpu.flag = FLAG_TRUE
         cpu.halted = True
         cpu.reset(start_address=300)
         assert cpu.acc == 0
         assert cpu.ix == 0
         assert cpu.pc == 300
-        assert cpu.flag is None
+        assert cpu.flag == FLAG_UNDEFINED
         assert cpu.halted is False
+
+    def test_unsigned_normalization(self):
+        """Unsigned registers wrap at both ends of the range."""
+        cpu = CPU(word_bits=8, signed=False)
+        cpu.set_acc(255)
+        assert cpu.acc == 255
+        cpu.set_acc(256)
+        assert cpu.acc == 0
+        cpu.set_acc(-1)
+        assert cpu.acc == 255
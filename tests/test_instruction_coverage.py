@@ -9,7 +9,8 @@ from typing import Callable
 import pytest
 
 from core import run_program, RunOptions
-from core.parser import VALID_OPCODES
+from core.instructions import INSTRUCTION_TABLE
+from core.parser import OPCODE_NAMES, OPCODE_TO_ID, VALID_OPCODES
 
 
 def expect_acc(value: int) -> Callable:
@@ -140,3 +141,9 @@ def test_all_instructions_have_behavioral_tests(case: InstructionCase):
 def test_instruction_case_coverage_matches_valid_opcodes():
     covered = {case.opcode for case in INSTRUCTION_CASES}
     assert covered == VALID_OPCODES
+
+
+def test_instruction_table_matches_opcode_ids():
+    assert len(INSTRUCTION_TABLE) == len(OPCODE_NAMES)
+    for name, op_id in OPCODE_TO_ID.items():
+        assert INSTRUCTION_TABLE[op_id].__name__ == f"execute_{name.lower()}"
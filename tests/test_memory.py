@@ -81,3 +81,35 @@ class TestMemory:
         assert snap == [1, 0, 3, 0, 0]
         snap[0] = 99
         assert mem.read(0) == 1  # Original unchanged
+
+    @pytest.mark.parametrize(
+        "word_bits,signed",
+        [(8, True), (16, True), (16, False), (64, False)],
+    )
+    def test_storage_is_fixed_width_array(self, word_bits, signed):
+        """Words are stored in the smallest array type that holds them."""
+        mem = Memory(size=4, word_bits=word_bits, signed=signed)
+        assert mem._data.itemsize * 8 == word_bits
+        assert mem._data.typecode.islower() == signed
+        assert mem.snapshot() == [0, 0, 0, 0]
+
+    def test_wide_word_extremes_round_trip(self):
+        """Extreme values survive storage at the widest array width."""
+        mem = Memory(size=2, word_bits=64, signed=False)
+        mem.write(0, -1)
+        assert mem.read(0) == (1 << 64) - 1
+        mem = Memory(size=2, word_bits=64, signed=True)
+        mem.write(0, 1 << 63)
+        assert mem.read(0) == -(1 << 63)
+
+    def test_oversized_words_fall_back_to_list(self):
+        """Word widths beyond 64 bits use plain Python ints."""
+        mem = Memory(size=2, word_bits=80, signed=False)
+        mem.write(0, (1 << 80) - 1)
+        assert mem.read(0) == (1 << 80) - 1
+
+    def test_get_watched_skips_out_of_range(self):
+        """Watched addresses outside memory are left out."""
+        mem = Memory(size=10, initial_values={0: 4, 9: 5})
+        assert mem.get_watched([-1, 0, 9, 10]) == {"0": 4, "9": 5}
+        assert mem.get_watched([]) == {}
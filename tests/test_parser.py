@@ -1,7 +1,7 @@
 """Tests for the Parser module."""
 
 import pytest
-from core.parser import parse_program, Instruction
+from core.parser import parse_program, Instruction, OperandType
 from core.errors import (
     ParseError,
     UnknownOpcode,
@@ -24,7 +24,7 @@ class TestParser:
         assert instr.opcode == "LDM"
         assert instr.operand == "#5"
         assert instr.operand_value == 5
-        assert instr.operand_type == "immediate"
+        assert instr.operand_type == OperandType.IMMEDIATE
 
     def test_sequential_addressing(self):
         """Instructions get sequential addresses."""
@@ -62,7 +62,7 @@ class TestParser:
         """Direct address operand."""
         result = parse_program("LDD 80")
         instr = result.instructions[200]
-        assert instr.operand_type == "direct"
+        assert instr.operand_type == OperandType.DIRECT
         assert instr.operand_value == 80
 
     def test_register_operand(self):
@@ -70,7 +70,7 @@ class TestParser:
         result = parse_program("INC ACC")
         instr = result.instructions[200]
         assert instr.operand == "ACC"
-        assert instr.operand_type == "register"
+        assert instr.operand_type == OperandType.REGISTER
 
     def test_unknown_opcode(self):
         """Unknown opcode raises error."""
@@ -82,6 +82,23 @@ class TestParser:
         with pytest.raises(InvalidOperand):
             parse_program("LDD")
 
+    @pytest.mark.parametrize("source", ["LDM ACC", "ADD IX", "CMP ACC", "SUB IX"])
+    def test_register_operand_not_accepted(self, source):
+        """Register operands on memory/immediate opcodes raise error."""
+        with pytest.raises(InvalidOperand):
+            parse_program(f"{source}\nEND")
+
+    @pytest.mark.parametrize("source", ["LDM 80", "LDM DATA", "LDR 80", "LDR IX", "LDR"])
+    def test_legacy_operand_forms_accepted(self, source):
+        """Forms the original parser accepted still parse."""
+        program = parse_program(f"{source}\nEND\n80 DATA: 7")
+        assert program.instructions[200].opcode == source.split()[0]
+
+    def test_invalid_direct_address(self):
+        """Operands starting with a digit must be decimal addresses."""
+        with pytest.raises(InvalidOperand, match="Invalid address: 8O"):
+            parse_program("LDD 8O\nEND")
+
     def test_label_definition(self):
         """Labels are defined and resolved."""
         program = """
@@ -94,6 +111,25 @@ class TestParser:
         jmp_instr = result.instructions[201]
         assert jmp_instr.operand_value == 200
 
+    def test_label_reference_case(self):
+        """Label references keep their spelling and resolve case-insensitively."""
+        result = parse_program("JMP done\nLDD 80\nDone: END")
+        assert result.instructions[200].operand == "done"
+        assert result.instructions[200].operand_upper == "DONE"
+        assert result.instructions[200].operand_value == 202
+        assert result.instructions[201].operand_upper is None
+
+    def test_crlf_line_endings(self):
+        """Windows line endings are accepted and keep line numbers."""
+        result = parse_program("LDM #1\r\n\r\nOUT\r\nEND\r\n")
+        assert result.instructions[201].source_line_no == 3
+        assert result.instructions[201].source_text == "OUT"
+
+    def test_ir_text(self):
+        """IR text is the canonical opcode plus the operand as written."""
+        result = parse_program("ldm   #5 ; load\ninc acc\nend")
+        assert [i.ir_text for i in result.instructions.values()] == ["LDM #5", "INC ACC", "END"]
+
     def test_mixed_address_mode_allowed(self):
         """Mixing explicit and sequential addresses is now allowed."""
         program = parse_program("200 LDM #5\nLDM #10", start_address=200)
@@ -109,11 +145,26 @@ class TestParser:
         assert program.instructions[200].opcode == "LDD"
         assert program.labels["START"] == 200
 
+    def test_colon_address_label_data(self):
+        """Colon address prefixes combine with labels and data lines."""
+        program = parse_program("80: COUNT: 7\n200:START:LDD COUNT\n201 : END")
+        assert program.initial_memory == {80: 7}
+        assert program.labels == {"COUNT": 80, "START": 200}
+        assert program.instructions[200].operand_value == 80
+        assert program.instructions[200].clean_text == "LDD COUNT"
+
     def test_duplicate_address_error(self):
         """Duplicate addresses raise error."""
         with pytest.raises(AddressConflict):
             parse_program("200 LDM #5\n200 LDM #10")
 
+    def test_duplicate_label_error(self):
+        """A label defined twice raises error."""
+        with pytest.raises(AddressConflict, match="Duplicate label: LOOP"):
+            parse_program("LOOP: LDM #5\nloop: END")
+        with pytest.raises(AddressConflict):
+            parse_program("START: END", labels={"START": 300})
+
     def test_empty_program(self):
         """Empty program raises error."""
         with pytest.raises(ParseError):
@@ -174,3 +225,68 @@ class TestParser:
         """Shift amount must be numeric."""
         with pytest.raises(InvalidShiftAmount):
             parse_program("LSR #foo\nEND")
+
+    def test_flag_defined_after_compare(self):
+        """Conditional jumps only reachable after a CMP are marked."""
+        program = parse_program(
+            "LOOP: LDD 80\nCMP #0\nJPE DONE\nDEC ACC\nSTO 80\nJMP LOOP\nDONE: END"
+        )
+        assert program.instructions[200].flag_defined is False
+        assert program.instructions[202].flag_defined is True
+        assert program.instructions[206].flag_defined is True
+
+    def test_flag_undefined_on_path_without_compare(self):
+        """A jump reachable around the CMP is not marked."""
+        program = parse_program(
+            "LDM #1\nJPN SKIP\nCMP #1\nSKIP: JPE DONE\nDONE: END"
+        )
+        assert program.instructions[201].flag_defined is False
+        assert program.instructions[203].flag_defined is False
+
+    def test_flag_undefined_when_loop_reenters_before_compare(self):
+        """A back edge into code preceding the CMP keeps the entry undefined."""
+        program = parse_program("START: JPE START\nCMP #0\nJMP START")
+        assert program.instructions[200].flag_defined is False
+        assert program.instructions[202].flag_defined is True
+
+    def test_compare_jump_fused(self):
+        """CMP followed by JPE/JPN is fused unless the jump is a target."""
+        program = parse_program(
+            "LOOP: LDD 80\nCMP #0\nJPE DONE\nCMP 81\nJPN LOOP\n"
+            "CMP #1\nAGAIN: JPE AGAIN\nDONE: END"
+        )
+        assert sorted(program.fused) == [201, 203]
+        assert program.fused[201].opcode == "CMPJPE"
+        assert program.fused[201].jump_target == 207
+        assert program.fused[201].steps == 2
+        assert program.fused[201].next_pc == 203
+        assert program.instructions[201].next_pc == 202
+        assert program.fused[203].opcode == "CMPJPN"
+        assert program.fused[203].jump_target == 200
+        assert program.instructions[201].opcode == "CMP"
+
+    def test_memory_update_fused(self):
+        """LDD a; INC/DEC ACC; STO a is fused unless entered mid-sequence."""
+        program = parse_program(
+            "LDD 80\nDEC ACC\nSTO 80\nLDD 81\nINC\nSTO 81\n"
+            "LDD 82\nDEC IX\nSTO 82\nLDD 83\nINC ACC\nSTO 84\n"
+            "LDD 85\nAGAIN: INC ACC\nSTO 85\nJMP AGAIN"
+        )
+        assert sorted(program.fused) == [200, 203]
+        assert program.fused[200].opcode == "DECMEM"
+        assert program.fused[200].operand_value == 80
+        assert program.fused[200].steps == 3
+        assert program.fused[200].next_pc == 203
+        assert program.fused[203].opcode == "INCMEM"
+
+    def test_basic_blocks(self):
+        """Blocks start at the entry, jump targets and after control flow."""
+        program = parse_program(
+            "LDM #3\nLOOP: DEC ACC\nCMP #0\nJPN LOOP\nOUT\n210 END"
+        )
+        assert sorted(program.blocks) == [200, 201, 204]
+        loop = program.blocks[201]
+        assert [instr.opcode for instr in loop.instructions] == ["DEC", "CMPJPN"]
+        assert loop.steps == 3
+        assert loop.next_pc == 204
+        assert program.blocks[204].next_pc == 205
@@ -3,6 +3,22 @@
 import pytest
 from core import run_program, RunOptions
 from core.errors import StepLimitExceeded, InputUnderflow, InvalidShiftAmount
+from core.instructions import (
+    bind_executors,
+    execute_add_imm,
+    execute_add_mem,
+    execute_cmp_imm,
+    execute_cmp_mem,
+    execute_dec_acc,
+    execute_dec_ix,
+    execute_end,
+    execute_inc_acc,
+    execute_inc_ix,
+    execute_ldr_acc,
+    execute_ldr_imm,
+)
+from core.parser import parse_program
+from core.runner import _PROGRAM_CACHE_SIZE, _load_program, _program_cache
 
 
 class TestInstructions:
@@ -21,6 +37,14 @@ class TestInstructions:
         assert result.status == "ok"
         assert result.final_state["acc"] == 100
 
+    def test_loads_see_normalized_words(self):
+        """Memory loads return words already normalized to the word width."""
+        opts = RunOptions(word_bits=8, signed=True, initial_memory={80: 81, 81: 200})
+        result = run_program("LDD 81\nSTO 82\nLDI 80\nEND", options=opts)
+        assert result.status == "ok"
+        assert result.final_state["acc"] == -56
+        assert result.trace[-1]["mem"]["82"] == -56
+
     def test_ldi(self):
         """LDI loads indirect."""
         opts = RunOptions(initial_memory={80: 81, 81: 42})
@@ -36,6 +60,27 @@ class TestInstructions:
         assert result.final_state["acc"] == 99
         assert result.final_state["ix"] == 5
 
+    def test_ldx_out_of_bounds(self):
+        """LDX past either end of memory is a memory access error."""
+        opts = RunOptions(memory_size=100)
+        result = run_program("LDR #5\nLDX 98\nEND", options=opts)
+        assert result.status == "error"
+        assert result.error.type == "MemoryAccessError"
+        result = run_program("LDR #-5\nLDX 2\nEND", options=opts)
+        assert result.status == "error"
+        assert result.error.type == "MemoryAccessError"
+
+    def test_ldm_direct_loads_address(self):
+        """LDM a and LDM LABEL load the address value itself."""
+        result = run_program("LDM 80\nADD DATA\nLDM DATA\nEND\n81 DATA: 7")
+        assert result.final_state["acc"] == 81
+
+    def test_ldr_other_operands_leave_ix(self):
+        """LDR a and LDR IX are accepted and leave IX unchanged."""
+        result = run_program("LDR #3\nLDR 80\nLDR IX\nEND", options=RunOptions(trace=False))
+        assert result.status == "ok"
+        assert result.final_state["ix"] == 3
+
     def test_ldr_immediate(self):
         """LDR #n sets IX."""
         result = run_program("LDR #10\nEND")
@@ -104,6 +149,15 @@ class TestInstructions:
         assert result.status == "ok"
         assert result.final_state["acc"] == 0b01011010
 
+    def test_bitwise_signed_words(self):
+        """Bitwise ops on negative words match the unsigned bit patterns."""
+        opts = RunOptions(word_bits=8, signed=True)
+        program = "LDM #-1\nXOR #B11110000\nOR #B10000000\nLSR #1\nLSL #2\nEND"
+        result = run_program(program, options=opts)
+        assert result.status == "ok"
+        # 0xFF ^ 0xF0 = 0x0F; | 0x80 = 0x8F; >> 1 = 0x47; << 2 = 0x1C
+        assert result.final_state["acc"] == 0x1C
+
     def test_and_memory_operand(self):
         """AND a uses memory contents."""
         opts = RunOptions(word_bits=8, initial_memory={90: int("00000100", 2)})
@@ -112,6 +166,14 @@ class TestInstructions:
         assert result.status == "ok"
         assert result.final_state["acc"] == 0b00000100
 
+    def test_or_xor_memory_operand(self):
+        """OR a and XOR a use memory contents."""
+        opts = RunOptions(word_bits=8, initial_memory={90: 0b00001111})
+        program = "LDM #B00110000\nOR 90\nXOR 90\nEND"
+        result = run_program(program, options=opts)
+        assert result.status == "ok"
+        assert result.final_state["acc"] == 0b00110000
+
     def test_inc_acc(self):
         """INC ACC increments ACC."""
         result = run_program("LDM #5\nINC ACC\nEND")
@@ -240,6 +302,13 @@ class TestIO:
         result = run_program("IN\nSTO 80\nIN\nSTO 81\nEND", input_text="AB")
         assert result.status == "ok"
 
+    def test_in_non_latin1(self):
+        """IN reads characters beyond Latin-1 as their code points."""
+        result = run_program("IN\nIN\nEND", input_text="é€")
+        assert result.status == "ok"
+        assert result.trace[1]["in_code"] == 233
+        assert result.trace[2]["in_code"] == 8364
+
     def test_in_underflow(self):
         """IN with empty buffer is error."""
         result = run_program("IN\nEND", input_text="")
@@ -252,6 +321,12 @@ class TestIO:
         assert result.status == "ok"
         assert result.output_text == "AB"
 
+    def test_out_low_byte(self):
+        """OUT writes the low byte of ACC, including negative values."""
+        result = run_program("LDM #-1\nOUT\nLDM #321\nOUT\nEND")
+        assert result.status == "ok"
+        assert result.output_text == "\xffA"
+
     def test_io_trace(self):
         """IO codes appear in trace."""
         opts = RunOptions(trace_include_io=True)
@@ -261,6 +336,10 @@ class TestIO:
         assert result.trace[1]["in_code"] == 88
         # OUT instruction
         assert result.trace[2]["out_code"] == 88
+        # Codes only show on the step that did the I/O
+        assert [(row["in_code"], row["out_code"]) for row in result.trace] == [
+            (None, None), (88, None), (None, 88), (None, None),
+        ]
 
     def test_trace_value_format_bin(self):
         """Trace values can be formatted as binary strings."""
@@ -297,6 +376,48 @@ class TestRunner:
         assert result.trace[2]["acc"] == 5
         assert result.trace[2]["mem"]["80"] == 5
 
+    def test_trace_rows_share_mem_until_store(self):
+        """Rows share one mem dict until a STO to a watched address replaces it."""
+        opts = RunOptions(trace_watch=[80])
+        result = run_program("LDM #5\nINC ACC\nSTO 80\nOUT\nEND", options=opts)
+        mems = [row["mem"] for row in result.trace]
+        assert mems[0] is mems[1] is mems[2]
+        assert mems[3] is not mems[2]
+        assert mems[3] is mems[4] is mems[5]
+        assert [mem["80"] for mem in mems] == [0, 0, 0, 6, 6, 6]
+
+    def test_rerun_same_program(self):
+        """Re-running cached source with other inputs and modes starts fresh."""
+        program = "IN\nSTO 80\nOUT\nEND"
+        first = run_program(program, input_text="A")
+        second = run_program(program, input_text="B", options=RunOptions(trace=False))
+        third = run_program(program, input_text="C")
+        assert (first.output_text, second.output_text, third.output_text) == ("A", "B", "C")
+        assert third.trace[2]["mem"]["80"] == ord("C")
+
+    def test_program_cache_bounded(self):
+        """Parsed programs are reused, keyed by digest, and the cache stays small."""
+        first = _load_program("LDM #1\nEND", 200)
+        assert _load_program("LDM #1\nEND", 200) is first
+        assert _load_program("LDM #1\nEND", 300) is not first
+        for n in range(_PROGRAM_CACHE_SIZE + 5):
+            _load_program(f"LDM #{n}\nEND", 200)
+        assert len(_program_cache) == _PROGRAM_CACHE_SIZE
+        assert all(isinstance(digest, bytes) for digest, _ in _program_cache)
+
+    def test_trace_watch_option_not_modified(self):
+        """Auto-watched addresses are reported without changing the options."""
+        opts = RunOptions(trace_watch=[90, 81], initial_memory={85: 1})
+        result = run_program("80 7\nLDD 80\nSTO 81\nEND", options=opts)
+        assert result.trace_watch == [80, 81, 85, 90]
+        assert opts.trace_watch == [90, 81]
+
+    def test_trace_includes_flag(self):
+        """Trace reports the flag as None until the first comparison."""
+        opts = RunOptions(trace_include_flag=True)
+        result = run_program("LDM #5\nCMP #4\nCMP #5\nEND", options=opts)
+        assert [row["flag"] for row in result.trace] == [None, None, False, True, True]
+
     def test_trace_includes_address(self):
         """Trace includes instruction address."""
         result = run_program("LDM #1\nLDM #2\nEND")
@@ -341,6 +462,24 @@ class TestRunner:
         assert result.status == "ok"
         assert result.final_state["acc"] == 0
 
+    def test_trace_max_entries(self):
+        """Rows stop at trace_max_entries while the program runs to the end."""
+        opts = RunOptions(trace_watch=[80], trace_max_entries=3)
+        result = run_program("LDM #5\nSTO 80\nINC ACC\nOUT\nEND", options=opts)
+        assert result.status == "ok"
+        assert result.steps_executed == 5
+        assert [row["step"] for row in result.trace] == [0, 1, 2]
+        assert result.trace[2]["mem"]["80"] == 5
+        assert result.trace_truncated is True
+        assert result.output_text == chr(6)
+
+    def test_trace_not_truncated_when_program_fits(self):
+        """A run that ends within the cap reports a complete trace."""
+        opts = RunOptions(trace_max_entries=4)
+        result = run_program("LDM #5\nSTO 80\nEND", options=opts)
+        assert len(result.trace) == 4
+        assert result.trace_truncated is False
+
     def test_trace_watch_list_in_result(self):
         """trace_watch is included in result."""
         opts = RunOptions(trace_watch=[80, 81, 82])
@@ -348,6 +487,139 @@ class TestRunner:
         assert result.trace_watch == [80, 81, 82]
 
 
+UNTRACED_CASES = [
+    ("LDM #5\nSTO 80\nLOOP: LDD 80\nCMP #0\nJPE DONE\nDEC ACC\nSTO 80\nJMP LOOP\nDONE: END", "", {}),
+    ("81 N: 3\nLOOP: LDD N\nCMP #0\nJPE STOP\nLDM #42\nOUT\nLDD N\nDEC ACC\nSTO N\nJMP LOOP\nSTOP: END", "", {}),
+    ("LDM #3\nCMP #5\nJPN ELSE\nLDM #0\nJMP DONE\nELSE: LDM #2\nDONE: END", "", {}),
+    ("IN\nCMP 80\nJPE YES\nLDM #78\nOUT\nEND\nYES: LDM #89\nOUT\nEND", "A", {"initial_memory": {80: 65}}),
+    ("LDM #1\nCMP #1\nJPE 200", "", {"max_steps": 7}),
+    ("LDM #1\nCMP #1\nJPE 200", "", {"max_steps": 8}),
+    ("LDM #1\nCMP #1\nJPE 200", "", {"max_steps": 3}),
+    ("LDM #1\nCMP #1\nJPE 250\nEND", "", {}),
+    ("LDM #1\nCMP #2\nJPN 250\nEND", "", {}),
+    ("LOOP: JMP LOOP", "", {"max_steps": 5}),
+    ("JPE 200", "", {}),
+    ("LDM #1\nCMP 150\nJPE 200", "", {"memory_size": 100}),
+    ("LDM #1\nJMP 210", "", {}),
+    ("LDM #1\nADD #2\nIN\nADD #3\nEND", "", {}),
+    ("LDM #1\nLDM #2\nLDM #3\nLDM #4\nEND", "", {"max_steps": 3}),
+    ("JMP MID\nLDM #1\nMID: ADD #5\nADD #6\nEND", "", {}),
+    ("200 LDM #1\n201 ADD #1\n203 END", "", {}),
+    ("80 7\nLDD 80\nINC ACC\nSTO 80\nLDD 80\nDEC\nSTO 81\nEND", "", {"word_bits": 8}),
+    ("80 127\nLDD 80\nINC ACC\nSTO 80\nEND", "", {"word_bits": 8}),
+    ("LDD 80\nDEC ACC\nSTO 80\nEND", "", {"memory_size": 50}),
+    ("LDD 80\nINC ACC\nSTO 80\nL: JMP L", "", {"max_steps": 3}),
+    ("LDD 80\nINC ACC\nSTO 80\n210 END", "", {}),
+    ("LDM #1\nLDD 80\nDEC\nSTO 80\n210 END", "", {}),
+    ("LDM #2\nSTO 80\nLOOP: LDD 80\nDEC ACC\nSTO 80\nCMP #0\nJPN LOOP\nEND", "", {"max_steps": 9}),
+]
+
+
+# Programs whose step budget runs out exactly at the end of a block, one per
+# kind of block ending: a plain instruction, a fused compare-and-jump and a
+# fused memory update
+BUDGET_CASES = [
+    ("LDM #1\nADD #1\nJMP 200", 3),
+    ("LDM #1\nCMP #1\nJPE 200", 3),
+    ("LDD 80\nINC ACC\nSTO 80\nL: JMP L", 3),
+    ("LDM #1\nLDD 80\nDEC\nSTO 80\nL: JMP L", 4),
+]
+
+
+class TestUntraced:
+    """Untraced runs may take faster paths but must report the same outcome."""
+
+    @pytest.mark.parametrize("program,input_text,kwargs", UNTRACED_CASES)
+    def test_matches_traced_run(self, program, input_text, kwargs):
+        traced = run_program(program, input_text, RunOptions(trace=True, **kwargs))
+        untraced = run_program(program, input_text, RunOptions(trace=False, **kwargs))
+        assert untraced.trace == []
+        assert untraced.status == traced.status
+        assert untraced.output_text == traced.output_text
+        assert untraced.steps_executed == traced.steps_executed
+        assert untraced.final_state == traced.final_state
+        assert (untraced.error and untraced.error.to_dict()) == (
+            traced.error and traced.error.to_dict()
+        )
+
+    @pytest.mark.parametrize("program,max_steps", BUDGET_CASES)
+    def test_step_limit_location_matches_traced_run(self, program, max_steps):
+        traced = run_program(program, options=RunOptions(max_steps=max_steps))
+        untraced = run_program(program, options=RunOptions(max_steps=max_steps, trace=False))
+        assert traced.error.type == "StepLimitExceeded"
+        assert untraced.error.type == "StepLimitExceeded"
+        assert untraced.error.addr == traced.error.addr
+        assert untraced.error.source_text == traced.error.source_text
+        assert untraced.steps_executed == traced.steps_executed == max_steps
+
+    @pytest.mark.parametrize("trace_max_entries", [1, 2])
+    @pytest.mark.parametrize("program,max_steps", BUDGET_CASES)
+    def test_truncated_trace_step_limit_location(self, program, max_steps, trace_max_entries):
+        traced = run_program(program, options=RunOptions(max_steps=max_steps))
+        capped = run_program(
+            program,
+            options=RunOptions(max_steps=max_steps, trace_max_entries=trace_max_entries),
+        )
+        assert capped.trace_truncated is True
+        assert capped.error.type == traced.error.type == "StepLimitExceeded"
+        assert capped.error.addr == traced.error.addr
+        assert capped.error.source_text == traced.error.source_text
+        assert capped.steps_executed == traced.steps_executed
+
+    @pytest.mark.parametrize("cap", [2, 3, 4])
+    @pytest.mark.parametrize("program,input_text,kwargs", UNTRACED_CASES)
+    def test_truncated_trace_matches_traced_run(self, program, input_text, kwargs, cap):
+        # Caps land both on block leaders and mid-block
+        traced = run_program(program, input_text, RunOptions(**kwargs))
+        capped = run_program(program, input_text, RunOptions(trace_max_entries=cap, **kwargs))
+        assert capped.trace == traced.trace[:cap]
+        assert capped.status == traced.status
+        assert capped.output_text == traced.output_text
+        assert capped.steps_executed == traced.steps_executed
+        assert capped.final_state == traced.final_state
+        assert (capped.error and capped.error.to_dict()) == (
+            traced.error and traced.error.to_dict()
+        )
+
+
+class TestDispatch:
+    """Test executor binding."""
+
+    def test_executors_bound_by_operand_type(self):
+        """ADD binds an immediate or memory executor once, before execution."""
+        program = parse_program("ADD #1\nADD 80\nEND")
+        bind_executors(program.instructions.values())
+        assert program.instructions[200].handler is execute_add_imm
+        assert program.instructions[201].handler is execute_add_mem
+        assert program.instructions[202].handler is execute_end
+
+    def test_ldr_and_cmp_bound_by_operand_type(self):
+        """LDR and CMP bind operand-specific executors."""
+        program = parse_program("LDR #1\nLDR ACC\nCMP #0\nCMP 80\nEND")
+        bind_executors(program.instructions.values())
+        handlers = [program.instructions[addr].handler for addr in range(200, 204)]
+        assert handlers == [
+            execute_ldr_imm,
+            execute_ldr_acc,
+            execute_cmp_imm,
+            execute_cmp_mem,
+        ]
+
+    def test_inc_dec_bound_by_register(self):
+        """INC and DEC bind a register-specific executor (ACC by default)."""
+        program = parse_program("INC\nINC ACC\nINC IX\nDEC\nDEC ACC\nDEC IX\nEND")
+        bind_executors(program.instructions.values())
+        handlers = [program.instructions[addr].handler for addr in range(200, 206)]
+        assert handlers == [
+            execute_inc_acc,
+            execute_inc_acc,
+            execute_inc_ix,
+            execute_dec_acc,
+            execute_dec_acc,
+            execute_dec_ix,
+        ]
+
+
 class TestAPIFormat:
     """Test result format matches API spec."""
 
@@ -0,0 +1,97 @@
+"""Tests for the FastAPI web adapter."""
+
+import inspect
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from core import run_program, RunOptions
+import web.app as web_app
+from web.app import app, FastJSONResponse
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def run(client, program, **options):
+    return client.post("/api/run", json={"program": program, "options": options})
+
+
+class TestInitialMemory:
+    """initial_memory keys are validated as addresses."""
+
+    def test_string_keys_become_addresses(self, client):
+        response = run(client, "LDD 80\nEND", initial_memory={"80": 10})
+        assert response.status_code == 200
+        assert response.json()["final_state"]["acc"] == 10
+
+    @pytest.mark.parametrize("key", ["x", "-5", "256", "999"])
+    def test_invalid_address_rejected(self, client, key):
+        response = run(client, "END", initial_memory={key: 10})
+        assert response.status_code == 422
+
+    def test_bound_follows_memory_size(self, client):
+        assert run(client, "END", memory_size=1000, initial_memory={"999": 1}).status_code == 200
+
+
+class TestResponse:
+    """Responses carry run_program's result dict unchanged."""
+
+    def test_matches_run_result(self, client):
+        program = "LDM #65\nSTO 80\nOUT\nEND"
+        response = run(client, program, trace_watch=[80])
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        expected = run_program(program, options=RunOptions(trace_watch=[80])).to_dict()
+        assert response.json() == expected
+
+    def test_render_without_orjson(self, monkeypatch):
+        content = {"trace": [{"step": 0, "mem": {"80": -1}}], "error": None}
+        fast = FastJSONResponse(content).body
+        monkeypatch.setattr(web_app, "orjson", None)
+        assert json.loads(FastJSONResponse(content).body) == json.loads(fast) == content
+
+
+class TestTraceCap:
+    """trace_max_entries bounds the trace returned by the API."""
+
+    def test_default_keeps_every_row(self, client):
+        body = run(client, "LOOP: JMP LOOP").json()
+        assert body["error"]["type"] == "StepLimitExceeded"
+        assert len(body["trace"]) == 10001
+        assert body["trace_truncated"] is False
+
+    def test_default_bounded_for_large_max_steps(self):
+        assert web_app.RunOptionsModel(max_steps=20000).trace_max_entries == 20001
+        assert web_app.RunOptionsModel(max_steps=1000000).trace_max_entries == 100000
+
+    def test_explicit_cap(self, client):
+        body = run(client, "LOOP: JMP LOOP", max_steps=50, trace_max_entries=10).json()
+        assert body["steps_executed"] == 50
+        assert len(body["trace"]) == 10
+        assert body["trace_truncated"] is True
+
+    def test_cap_above_limit_rejected(self, client):
+        assert run(client, "END", trace_max_entries=100001).status_code == 422
+
+
+class TestEndpoint:
+    """Endpoint wiring."""
+
+    def test_default_run_options(self):
+        assert web_app.DEFAULT_RUN_OPTIONS == web_app.to_run_options(web_app.RunOptionsModel())
+        assert web_app.DEFAULT_RUN_OPTIONS.trace_max_entries == 10001
+
+    def test_request_without_options(self, client):
+        program = "LDM #3\nSTO 80\nEND"
+        response = client.post("/api/run", json={"program": program})
+        expected = run_program(program, options=RunOptions(trace_max_entries=10001)).to_dict()
+        assert response.json() == expected
+        # The shared defaults are left untouched by the run
+        assert web_app.DEFAULT_RUN_OPTIONS.trace_watch == []
+
+    def test_run_code_is_sync(self):
+        # Sync handlers run in FastAPI's thread pool instead of the event loop
+        assert not inspect.iscoroutinefunction(web_app.run_code)
@@ -0,0 +1,24 @@
+"""Tests for the word-width helpers."""
+
+import pytest
+from core.word import make_normalizer
+
+
+class TestNormalizer:
+    """Normalizer closure tests."""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [(0, 0), (127, 127), (128, -128), (255, -1), (256, 0), (-1, -1), (-129, 127)],
+    )
+    def test_signed_8bit(self, value, expected):
+        """Signed values wrap into [-128, 127]."""
+        assert make_normalizer(8, True)(value) == expected
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [(0, 0), (255, 255), (256, 0), (-1, 255), (-256, 0)],
+    )
+    def test_unsigned_8bit(self, value, expected):
+        """Unsigned values wrap into [0, 255]."""
+        assert make_normalizer(8, False)(value) == expected
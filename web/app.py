@@ -2,13 +2,19 @@
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional
 from pathlib import Path
 import sys
 import os
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -17,9 +23,19 @@ from core import run_program, RunOptions
 
 # Constants
 MAX_PROGRAM_SIZE = 50 * 1024  # 50KB
+MAX_TRACE_ENTRIES = 100000
 STATIC_DIR = Path(__file__).parent.parent / "static"
 
 
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when it is installed."""
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
+
+
 # Request/Response models
 class RunOptionsModel(BaseModel):
     memory_size: int = Field(default=256, ge=1, le=65536)
@@ -32,7 +48,45 @@ class RunOptionsModel(BaseModel):
     trace_include_ix: bool = False
     trace_include_flag: bool = False
     trace_include_io: bool = True
-    initial_memory: dict[str, int] = Field(default_factory=dict)
+    # Defaults to every row of a max_steps run (max_steps + 1), within the limit
+    trace_max_entries: Optional[int] = Field(default=None, ge=1, le=MAX_TRACE_ENTRIES)
+    # JSON object keys arrive as strings; pydantic validates them as addresses
+    initial_memory: dict[int, int] = Field(default_factory=dict)
+
+    @model_validator(mode="after")
+    def check_initial_memory_addresses(self) -> "RunOptionsModel":
+        for addr in self.initial_memory:
+            if not 0 <= addr < self.memory_size:
+                raise ValueError(f"initial_memory address out of range: {addr}")
+        return self
+
+    @model_validator(mode="after")
+    def default_trace_max_entries(self) -> "RunOptionsModel":
+        if self.trace_max_entries is None:
+            self.trace_max_entries = min(self.max_steps + 1, MAX_TRACE_ENTRIES)
+        return self
+
+
+def to_run_options(opts: RunOptionsModel) -> RunOptions:
+    """Convert validated request options to runner options."""
+    return RunOptions(
+        memory_size=opts.memory_size,
+        start_address=opts.start_address,
+        max_steps=opts.max_steps,
+        word_bits=opts.word_bits,
+        signed=opts.signed,
+        trace=opts.trace,
+        trace_watch=opts.trace_watch,
+        trace_include_ix=opts.trace_include_ix,
+        trace_include_flag=opts.trace_include_flag,
+        trace_include_io=opts.trace_include_io,
+        trace_max_entries=opts.trace_max_entries,
+        initial_memory=opts.initial_memory,
+    )
+
+
+# run_program never modifies its options, so one instance serves every request
+DEFAULT_RUN_OPTIONS = to_run_options(RunOptionsModel())
 
 
 class RunRequest(BaseModel):
@@ -64,6 +118,7 @@ class RunResponse(BaseModel):
     final_state: dict
     trace_watch: list[int]
     trace: list[dict]
+    trace_truncated: bool = False
     error: Optional[dict] = None
 
 
@@ -85,7 +140,7 @@ app.add_middleware(
 
 
 @app.post("/api/run", response_model=RunResponse)
-async def run_code(request: RunRequest):
+def run_code(request: RunRequest):
     """Execute a Cambridge Assembly program.
     
     Args:
@@ -101,33 +156,11 @@ async def run_code(request: RunRequest):
             detail=f"Program size exceeds limit of {MAX_PROGRAM_SIZE} bytes",
         )
     
-    # Build options
-    opts = request.options or RunOptionsModel()
-    
-    # Convert initial_memory keys from string to int
-    initial_memory = {}
-    for k, v in opts.initial_memory.items():
-        try:
-            initial_memory[int(k)] = v
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid memory address key: {k}",
-            )
-    
-    run_opts = RunOptions(
-        memory_size=opts.memory_size,
-        start_address=opts.start_address,
-        max_steps=opts.max_steps,
-        word_bits=opts.word_bits,
-        signed=opts.signed,
-        trace=opts.trace,
-        trace_watch=opts.trace_watch,
-        trace_include_ix=opts.trace_include_ix,
-        trace_include_flag=opts.trace_include_flag,
-        trace_include_io=opts.trace_include_io,
-        initial_memory=initial_memory,
-    )
+    # Build options (requests without options share the prebuilt defaults)
+    if request.options is None:
+        run_opts = DEFAULT_RUN_OPTIONS
+    else:
+        run_opts = to_run_options(request.options)
     
     # Execute program
     result = run_program(
@@ -136,7 +169,9 @@ async def run_code(request: RunRequest):
         options=run_opts,
     )
     
-    return result.to_dict()
+    # Returned as a response so the trace is encoded once, without a
+    # RunResponse validation pass (response_model still documents the schema)
+    return FastJSONResponse(result.to_dict())
 
 
 # Mount static files AFTER API routes to prevent shadowing